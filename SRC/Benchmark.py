@@ -0,0 +1,202 @@
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from Bernouli import BernoulliNB, pack_bits
+from Gaussian import GaussianNB
+from Multinomial import CSRMatrix, MultinomialNB
+
+# ==================== Synthetic Data ====================
+
+def make_gaussian(n_samples, n_features, n_classes, rng):
+    """Class-shifted normal features"""
+    y = rng.integers(0, n_classes, n_samples)
+    centers = rng.normal(0, 2, (n_classes, n_features))
+    X = rng.standard_normal((n_samples, n_features))
+    X += centers[y]
+    return X, y
+
+def make_bernoulli(n_samples, n_features, n_classes, rng, density=0.1):
+    """Binary features with a per-class probability of being set"""
+    y = rng.integers(0, n_classes, n_samples)
+    p = rng.uniform(0, 2 * density, (n_classes, n_features))
+    X = rng.random((n_samples, n_features), dtype=np.float32) < p[y]
+    return X, y
+
+def make_multinomial(n_samples, n_features, n_classes, rng, doc_length=20):
+    """CSR word counts: Zipf-distributed tokens, rotated by a per-class offset"""
+    y = rng.integers(0, n_classes, n_samples)
+    shift = rng.integers(0, n_features, n_classes)
+    rows = np.repeat(np.arange(n_samples), doc_length)
+    tokens = (rng.zipf(1.3, n_samples * doc_length) - 1 + shift[y][rows]) % n_features
+    keys, counts = np.unique(rows * n_features + tokens, return_counts=True)
+    indptr = np.zeros(n_samples + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys // n_features, minlength=n_samples), out=indptr[1:])
+    return CSRMatrix(counts, keys % n_features, indptr, (n_samples, n_features)), y
+
+# Which inputs each variant can be benchmarked with
+VARIANT_INPUTS = {
+    "multinomial": ("sparse", "dense"),
+    "bernoulli": ("dense", "packed"),
+    "gaussian": ("dense",),
+}
+
+def estimate_bytes(variant, input_kind, n_samples, n_features, n_classes, doc_length=20):
+    """Rough peak footprint of data plus model, used to skip infeasible grid points"""
+    model = 3 * n_classes * n_features * 8
+    if input_kind == "sparse":
+        return model + n_samples * doc_length * 40
+    if input_kind == "packed":
+        return model + n_samples * n_features * 2
+    width = 1 if variant == "bernoulli" else 8
+    return model + 3 * n_samples * n_features * width
+
+def make_data(variant, input_kind, n_samples, n_features, n_classes, rng):
+    if variant == "gaussian":
+        return make_gaussian(n_samples, n_features, n_classes, rng)
+    if variant == "bernoulli":
+        return make_bernoulli(n_samples, n_features, n_classes, rng)
+    X, y = make_multinomial(n_samples, n_features, n_classes, rng)
+    return (X.toarray() if input_kind == "dense" else X), y
+
+# ==================== Timing ====================
+
+def take_rows(X, start, stop):
+    if isinstance(X, CSRMatrix):
+        return X.row_slice(start, stop)
+    return X[start:stop]
+
+def measure(func, repeat):
+    """Best wall-clock time over repeat untraced runs, then one traced run for the peak allocation
+
+    tracemalloc slows every allocation (Python-level loops far more than BLAS calls),
+    so it never runs while the clock does.
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+def run_case(variant, input_kind, n_samples, n_features, n_classes, chunk_size, n_predict, repeat, seed):
+    """Time fit, partial_fit (in chunks) and batch predict for one grid point"""
+    rng = np.random.default_rng(seed)
+    X, y = make_data(variant, input_kind, n_samples, n_features, n_classes, rng)
+    model_class = {"multinomial": MultinomialNB, "bernoulli": BernoulliNB, "gaussian": GaussianNB}[variant]
+
+    # "packed" trains on the dense rows and only changes how prediction input is stored
+    def fit():
+        return model_class().fit(X, y)
+
+    def partial_fit():
+        model = model_class()
+        for start in range(0, n_samples, chunk_size):
+            model.partial_fit(take_rows(X, start, start + chunk_size), y[start:start + chunk_size])
+        return model
+
+    results = []
+    fit_time, fit_peak, model = measure(fit, repeat)
+    results.append(("fit", fit_time, fit_peak, n_samples))
+    pf_time, pf_peak, _ = measure(partial_fit, repeat)
+    results.append(("partial_fit", pf_time, pf_peak, n_samples))
+
+    X_pred = take_rows(X, 0, min(n_predict, n_samples))
+    n_pred = X_pred.shape[0]
+    if input_kind == "packed":
+        packed = pack_bits(X_pred)
+        model.predict_packed(packed[:1])  # build the weight table outside the timed region
+        predict = lambda: model.predict_packed(packed)
+    else:
+        predict = lambda: model.predict(X_pred)
+    pred_time, pred_peak, _ = measure(predict, repeat)
+    results.append(("predict", pred_time, pred_peak, n_pred))
+
+    return [
+        {"variant": variant, "input": input_kind, "n_samples": n_samples, "n_features": n_features,
+         "n_classes": n_classes, "phase": phase, "seconds": seconds,
+         "rows_per_sec": rows / seconds if seconds > 0 else None, "peak_bytes": peak}
+        for phase, seconds, peak, rows in results
+    ]
+
+# ==================== Comparison ====================
+
+CASE_KEYS = ("variant", "input", "n_samples", "n_features", "n_classes", "phase")
+
+def load_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare(baseline, current, threshold=1.10):
+    """Rows present in both runs with their time ratio; ratio > threshold flags a regression"""
+    base = {tuple(r[k] for k in CASE_KEYS): r for r in baseline if "seconds" in r}
+    rows = []
+    for r in current:
+        key = tuple(r.get(k) for k in CASE_KEYS)
+        if "seconds" in r and key in base:
+            ratio = r["seconds"] / base[key]["seconds"]
+            rows.append({**dict(zip(CASE_KEYS, key)), "baseline_seconds": base[key]["seconds"],
+                         "seconds": r["seconds"], "ratio": ratio, "regression": ratio > threshold})
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Naive Bayes variants on synthetic data")
+    parser.add_argument("--variants", nargs="+", default=list(VARIANT_INPUTS), choices=list(VARIANT_INPUTS))
+    parser.add_argument("--inputs", nargs="+", default=["dense", "sparse", "packed"],
+                        choices=["dense", "sparse", "packed"])
+    parser.add_argument("--samples", nargs="+", type=float, default=[1e3, 1e5])
+    parser.add_argument("--features", nargs="+", type=float, default=[10, 1e3])
+    parser.add_argument("--classes", nargs="+", type=float, default=[2, 20])
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows per partial_fit call")
+    parser.add_argument("--predict-rows", type=int, default=100000, help="rows scored in the predict phase")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-bytes", type=float, default=4e9, help="skip grid points estimated above this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="append JSON lines here instead of stdout")
+    parser.add_argument("--compare", help="earlier results file to compare this run against")
+    args = parser.parse_args()
+
+    environment = {"python": platform.python_version(), "numpy": np.__version__,
+                   "machine": platform.machine(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    out = open(args.output, "a") if args.output else sys.stdout
+    records = []
+    grid = itertools.product(args.variants, args.inputs, args.samples, args.features, args.classes)
+    for variant, input_kind, n_samples, n_features, n_classes in grid:
+        if input_kind not in VARIANT_INPUTS[variant]:
+            continue
+        n_samples, n_features, n_classes = int(n_samples), int(n_features), int(n_classes)
+        case = {"variant": variant, "input": input_kind, "n_samples": n_samples,
+                "n_features": n_features, "n_classes": n_classes}
+        if estimate_bytes(variant, input_kind, n_samples, n_features, n_classes) > args.max_bytes:
+            rows = [{**case, "skipped": "estimated memory above --max-bytes"}]
+        else:
+            rows = run_case(variant, input_kind, n_samples, n_features, n_classes,
+                            args.chunk_size, args.predict_rows, args.repeat, args.seed)
+        for row in rows:
+            row.update(environment)
+            records.append(row)
+            out.write(json.dumps(row) + "\n")
+            out.flush()
+    if args.output:
+        out.close()
+
+    if args.compare:
+        for row in compare(load_results(args.compare), records):
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['variant']:12s} {row['input']:7s} n={row['n_samples']:<9d} k={row['n_features']:<8d} "
+                  f"C={row['n_classes']:<6d} {row['phase']:12s} x{row['ratio']:.2f}{flag}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,199 +1,401 @@
+import logging
 import math
 
+import numpy as np
+
+from Instrumentation import enable_tracing, phase
+from Multinomial import log_sum_exp
+from Versions import next_version
+
 def fmt(x):
     """Format numbers for better display"""
     return f"{x:.4f}"
 
-print("\n" + "="*60)
-print("📘 Bernoulli Naive Bayes - Educational Version")
-print("="*60 + "\n")
-
-# ==================== Section 1: Training Data ====================
-print("🔹 **Section 1: Training Data**\n")
-
-# Training data for spam and ham
-# [presence of 'free', presence of 'win']
-spam = [[1, 1], [1, 0], [1, 1]]
-ham  = [[0, 0], [0, 1], [0, 0]]
-
-print("Spam training data:")
-print("   Email | free | win")
-for i, email in enumerate(spam):
-    print(f"   Email{i+1} |   {email[0]}   |  {email[1]}")
-
-print("\nHam training data:")
-print("   Email | free | win")
-for i, email in enumerate(ham):
-    print(f"   Email{i+1} |   {email[0]}   |  {email[1]}")
-
-# Test email
-x = [1, 0]
-print(f"\n📧 **Test Email:** free={x[0]}, win={x[1]}")
-
-# ==================== Section 2: Feature Probability Calculation ====================
-print("\n" + "-"*60)
-print("🔹 **Section 2: Feature Probability Calculation with Laplacian Smoothing**\n")
+# ==================== Vectorized Engine ====================
+
+def pack_bits(X):
+    """Pack an (n_samples x k) binary matrix into uint64 words, 64 features per word"""
+    X = np.asarray(X) > 0
+    packed = np.packbits(X, axis=1, bitorder="little")
+    pad = -packed.shape[1] % 8
+    if pad:
+        packed = np.pad(packed, ((0, 0), (0, pad)))
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+def unpack_bits(packed, n_features):
+    """Inverse of pack_bits"""
+    as_bytes = np.ascontiguousarray(packed).view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1, count=n_features, bitorder="little")
+
+class BernoulliNB:
+    """Bernoulli Naive Bayes over binary feature vectors, trainable batch by batch"""
+
+    def __init__(self, alpha=1):
+        self.alpha = alpha
+        self.classes_ = None
+        self.version_ = 0
+
+    def fit(self, X, y):
+        """Learn priors and P(feature=1 | class) from an (n_samples x k) binary matrix"""
+        self.classes_ = None
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y):
+        """Fold one more batch into the stored counts without revisiting earlier data
+
+        Smoothed log-probabilities are recomputed lazily, and only for classes
+        whose counts changed.
+        """
+        with phase("bernoulli", "counting", X) as timer:
+            X = (np.asarray(X) > 0).astype(np.float64)
+            classes, y_idx = np.unique(np.asarray(y), return_inverse=True)
+            Y = np.zeros((X.shape[0], len(classes)))
+            Y[np.arange(X.shape[0]), y_idx] = 1
+            class_count = Y.sum(axis=0)
+            feature_count = Y.T @ X  # documents with feature=1, per class
+            timer.allocated(X, Y, feature_count)
+            return self._merge_counts(classes, class_count, feature_count)
+
+    def merge(self, other):
+        """Add the counts of a model trained on other data (e.g. another shard)"""
+        if other.classes_ is None:
+            return self
+        return self._merge_counts(other.classes_, other.class_count_.copy(), other.feature_count_.copy())
+
+    def _merge_counts(self, classes, class_count, feature_count):
+        if self.classes_ is None:
+            self.classes_, self.class_count_, self.feature_count_ = classes, class_count, feature_count
+            self._log_p = np.zeros_like(feature_count)
+            self._log_not_p = np.zeros_like(feature_count)
+            self._stale = np.ones(len(classes), dtype=bool)
+            self._weights_cache = None
+            self.version_ = next_version()
+            return self
+
+        if feature_count.shape[1] != self.feature_count_.shape[1]:
+            raise ValueError(
+                f"X has {feature_count.shape[1]} features, expected {self.feature_count_.shape[1]}"
+            )
+        all_classes = np.union1d(self.classes_, classes)
+        if len(all_classes) != len(self.classes_):
+            old = np.searchsorted(all_classes, self.classes_)
+            k = self.feature_count_.shape[1]
+            grown = {name: np.zeros((len(all_classes), k)) for name in ("count", "log_p", "log_not_p")}
+            grown["count"][old] = self.feature_count_
+            grown["log_p"][old] = self._log_p
+            grown["log_not_p"][old] = self._log_not_p
+            prior = np.zeros(len(all_classes))
+            prior[old] = self.class_count_
+            stale = np.ones(len(all_classes), dtype=bool)
+            stale[old] = self._stale
+            self.classes_, self.class_count_, self._stale = all_classes, prior, stale
+            self.feature_count_ = grown["count"]
+            self._log_p, self._log_not_p = grown["log_p"], grown["log_not_p"]
+
+        rows = np.searchsorted(self.classes_, classes)
+        self.feature_count_[rows] += feature_count
+        self.class_count_[rows] += class_count
+        self._stale[rows] = True
+        self._weights_cache = None
+        self.version_ = next_version()
+        return self
+
+    def _refresh(self):
+        """Laplace smoothing (count + α) / (n + 2α) for classes whose counts changed"""
+        if self._stale.any():
+            with phase("bernoulli", "smoothing") as timer:
+                n = self.class_count_[self._stale, np.newaxis]
+                p = (self.feature_count_[self._stale] + self.alpha) / (n + 2 * self.alpha)
+                timer.allocated(p)
+            with phase("bernoulli", "log_table"):
+                self._log_p[self._stale] = np.log(p)
+                self._log_not_p[self._stale] = np.log1p(-p)
+                self._stale[:] = False
+
+    @property
+    def feature_log_prob_(self):
+        """log(P(feature=1 | class)), shape (n_classes x k)"""
+        self._refresh()
+        return self._log_p
+
+    @property
+    def feature_log_neg_prob_(self):
+        """log(P(feature=0 | class)), shape (n_classes x k)"""
+        self._refresh()
+        return self._log_not_p
+
+    @property
+    def class_log_prior_(self):
+        return np.log(self.class_count_) - np.log(self.class_count_.sum())
+
+    def get_state(self):
+        """Arrays that fully describe the fitted model, for saving"""
+        self._refresh()
+        return {
+            "class_count": self.class_count_,
+            "feature_count": self.feature_count_,
+            "feature_log_prob": self._log_p,
+            "feature_log_neg_prob": self._log_not_p,
+        }
+
+    def set_state(self, classes, arrays):
+        """Restore a fitted model from get_state() arrays (which may be memory-mapped)"""
+        self.classes_ = np.asarray(classes)
+        self.class_count_ = arrays["class_count"]
+        self.feature_count_ = arrays["feature_count"]
+        self._log_p = arrays["feature_log_prob"]
+        self._log_not_p = arrays["feature_log_neg_prob"]
+        self._stale = np.zeros(len(self.classes_), dtype=bool)
+        self._weights_cache = None
+        self.version_ = next_version()
+        return self
+
+    def _scoring_weights(self):
+        """(k x n_classes) weights log p - log(1-p) and the per-class Σ log(1-p)
+
+        The same size as the model's own log p table, built once per model version
+        and shared by dense and bit-packed scoring.
+        """
+        if self._weights_cache is None or self._stale.any():
+            log_p, log_not_p = self.feature_log_prob_, self.feature_log_neg_prob_
+            with phase("bernoulli", "log_table") as timer:
+                weights = np.ascontiguousarray((log_p - log_not_p).T)
+                timer.allocated(weights)
+            self._weights_cache = (weights, log_not_p.sum(axis=1))
+        return self._weights_cache
+
+    def log_likelihood(self, X, out=None):
+        """log(P(x | class)) without the class prior, written into out when given"""
+        weights, neg_sum = self._scoring_weights()
+        fresh = out is None
+        with phase("bernoulli", "likelihood", X) as timer:
+            X = (np.asarray(X) > 0).astype(np.float64)
+            # Σ x·log p + (1-x)·log(1-p) = Σ x·(log p - log(1-p)) + Σ log(1-p)
+            out = np.matmul(X, weights, out=out)
+            out += neg_sum
+            timer.allocated(X)
+            if fresh:
+                timer.allocated(out)
+            return out
+
+    def joint_log_likelihood(self, X):
+        """log(P(x | class)) + log(P(class)) for every sample and class"""
+        jll = self.log_likelihood(X)
+        jll += self.class_log_prior_
+        return jll
+
+    def predict_log_proba(self, X):
+        """Normalized log posteriors, shape (n_samples x n_classes)"""
+        jll = self.joint_log_likelihood(X)
+        with phase("bernoulli", "normalization", jll) as timer:
+            log_proba = jll - log_sum_exp(jll, axis=1)[:, np.newaxis]
+            timer.allocated(log_proba)
+            return log_proba
+
+    def predict_proba(self, X):
+        """Normalized posteriors, shape (n_samples x n_classes)"""
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X):
+        """Most probable class label for each sample"""
+        return self.classes_[np.argmax(self.joint_log_likelihood(X), axis=1)]
+
+    # ---------- Bit-packed scoring ----------
+
+    def joint_log_likelihood_packed(self, packed, block_elements=1 << 20):
+        """Same as joint_log_likelihood for rows already packed with pack_bits
+
+        Rows are unpacked a block at a time (about block_elements bits), so only the
+        packed batch, one unpacked block and the (k x C) weights are ever in memory.
+        """
+        weights, neg_sum = self._scoring_weights()
+        k = weights.shape[0]
+        as_bytes = np.ascontiguousarray(packed).view(np.uint8)
+        expected = -(-k // 64) * 8
+        if as_bytes.shape[1] != expected:
+            raise ValueError(f"packed rows have {as_bytes.shape[1]} bytes, expected {expected}")
+        with phase("bernoulli", "likelihood", as_bytes) as timer:
+            jll = np.empty((as_bytes.shape[0], len(neg_sum)))
+            step = max(block_elements // k, 1)
+            for start in range(0, as_bytes.shape[0], step):
+                bits = np.unpackbits(as_bytes[start:start + step], axis=1, count=k, bitorder="little")
+                jll[start:start + step] = bits.astype(np.float64) @ weights
+            jll += neg_sum + self.class_log_prior_
+            timer.allocated(jll)
+            return jll
+
+    def predict_packed(self, packed):
+        """Most probable class label for each bit-packed sample"""
+        return self.classes_[np.argmax(self.joint_log_likelihood_packed(packed), axis=1)]
+
+# ==================== Step-by-Step Calculations ====================
+
+logger = logging.getLogger(__name__)
 
 def feature_probability(data, index, feature_name, class_name):
     """Calculate feature probability with Laplacian Smoothing"""
     count = sum(row[index] for row in data)
     n = len(data)
-    
-    print(f"Calculating P({feature_name}=1 | {class_name}):")
-    print(f"  Number of {class_name} emails with {feature_name}=1: {count}")
-    print(f"  Total number of {class_name} emails: {n}")
-    print(f"  Formula: (count + 1) / (n + 2)")
-    print(f"  Calculation: ({count} + 1) / ({n} + 2) = {count+1} / {n+2}")
-    
     probability = (count + 1) / (n + 2)
-    print(f"  Result: {fmt(probability)}\n")
+    
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Calculating P({feature_name}=1 | {class_name}):")
+        logger.debug(f"  Number of {class_name} emails with {feature_name}=1: {count}")
+        logger.debug(f"  Total number of {class_name} emails: {n}")
+        logger.debug(f"  Formula: (count + 1) / (n + 2)")
+        logger.debug(f"  Calculation: ({count} + 1) / ({n} + 2) = {count+1} / {n+2}")
+        logger.info(f"  Result: {fmt(probability)}\n")
     
     return probability
 
-# Calculate probabilities for each feature
-print("📊 **For Spam class:**")
-p_free_spam = feature_probability(spam, 0, "free", "spam")
-p_win_spam = feature_probability(spam, 1, "win", "spam")
-
-print("📊 **For Ham class:**")
-p_free_ham = feature_probability(ham, 0, "free", "ham")
-p_win_ham = feature_probability(ham, 1, "win", "ham")
-
-# ==================== Section 3: Conditional Probability Calculation ====================
-print("-"*60)
-print("🔹 **Section 3: Calculating P(x | class)**\n")
-
-print("Formula: P(x | class) = PRODUCT of all P(feature_i | class)")
-print("The symbol Π (capital pi) means 'product' - multiply all terms together")
-print(f"For test email: x = [free={x[0]}, win={x[1]}]")
-
-print("\n📌 **For Spam class:**")
-if x[0] == 1:
-    prob_free_spam = p_free_spam
-    print(f"  P(free=1 | spam) = {fmt(p_free_spam)}")
-else:
-    prob_free_spam = 1 - p_free_spam
-    print(f"  P(free=0 | spam) = 1 - P(free=1 | spam) = 1 - {fmt(p_free_spam)} = {fmt(prob_free_spam)}")
-
-if x[1] == 1:
-    prob_win_spam = p_win_spam
-    print(f"  P(win=1 | spam)  = {fmt(p_win_spam)}")
-else:
-    prob_win_spam = 1 - p_win_spam
-    print(f"  P(win=0 | spam)  = 1 - P(win=1 | spam) = 1 - {fmt(p_win_spam)} = {fmt(prob_win_spam)}")
-
-p_x_spam = prob_free_spam * prob_win_spam
-print(f"\n  P(x | spam) = P(free={x[0]} | spam) × P(win={x[1]} | spam)")
-print(f"              = {fmt(prob_free_spam)} × {fmt(prob_win_spam)}")
-print(f"              = {fmt(p_x_spam)}")
-
-print("\n📌 **For Ham class:**")
-if x[0] == 1:
-    prob_free_ham = p_free_ham
-    print(f"  P(free=1 | ham)  = {fmt(p_free_ham)}")
-else:
-    prob_free_ham = 1 - p_free_ham
-    print(f"  P(free=0 | ham)  = 1 - P(free=1 | ham) = 1 - {fmt(p_free_ham)} = {fmt(prob_free_ham)}")
-
-if x[1] == 1:
-    prob_win_ham = p_win_ham
-    print(f"  P(win=1 | ham)   = {fmt(p_win_ham)}")
-else:
-    prob_win_ham = 1 - p_win_ham
-    print(f"  P(win=0 | ham)   = 1 - P(win=1 | ham) = 1 - {fmt(p_win_ham)} = {fmt(prob_win_ham)}")
-
-p_x_ham = prob_free_ham * prob_win_ham
-print(f"\n  P(x | ham) = P(free={x[0]} | ham) × P(win={x[1]} | ham)")
-print(f"             = {fmt(prob_free_ham)} × {fmt(prob_win_ham)}")
-print(f"             = {fmt(p_x_ham)}")
-
-# ==================== Section 4: Prior Probabilities ====================
-print("\n" + "-"*60)
-print("🔹 **Section 4: Incorporating Prior Probabilities (Priors)**\n")
-
-p_spam = 0.5
-p_ham = 0.5
-
-print("Assuming balanced training data:")
-print(f"  P(spam) = {p_spam}")
-print(f"  P(ham)  = {p_ham}")
-
-print("\n📌 **Calculating Posterior (without normalization):**")
-print("  Bayes formula: P(class | x) is PROPORTIONAL TO P(x | class) × P(class)")
-print("  The symbol ∝ means 'is proportional to' (we'll normalize later)")
-
-posterior_spam = p_x_spam * p_spam
-posterior_ham = p_x_ham * p_ham
-
-print(f"\n  For spam: P(spam | x) ∝ P(x | spam) × P(spam)")
-print(f"           ∝ {fmt(p_x_spam)} × {fmt(p_spam)}")
-print(f"           ∝ {fmt(posterior_spam)}")
-
-print(f"\n  For ham:  P(ham | x) ∝ P(x | ham) × P(ham)")
-print(f"           ∝ {fmt(p_x_ham)} × {fmt(p_ham)}")
-print(f"           ∝ {fmt(posterior_ham)}")
-
-# ==================== Section 5: Final Decision ====================
-print("\n" + "-"*60)
-print("🔹 **Section 5: Final Decision**\n")
-
-print("Comparing unnormalized posterior probabilities:")
-print(f"  P(spam | x) ∝ {fmt(posterior_spam)}")
-print(f"  P(ham | x)  ∝ {fmt(posterior_ham)}")
-
-print("\n📌 **Calculating normalized probabilities:**")
-total = posterior_spam + posterior_ham
-print(f"  Total probability = P(spam | x) + P(ham | x)")
-print(f"                     = {fmt(posterior_spam)} + {fmt(posterior_ham)}")
-print(f"                     = {fmt(total)}")
-
-if total > 0:
-    normalized_spam = posterior_spam / total
-    normalized_ham = posterior_ham / total
-    print(f"\n  P(spam | x) = P(spam | x) / Total")
-    print(f"               = {fmt(posterior_spam)} / {fmt(total)}")
-    print(f"               = {fmt(normalized_spam)}")
-    print(f"               = {fmt(normalized_spam*100)}%")
-    
-    print(f"\n  P(ham | x) = P(ham | x) / Total")
-    print(f"              = {fmt(posterior_ham)} / {fmt(total)}")
-    print(f"              = {fmt(normalized_ham)}")
-    print(f"              = {fmt(normalized_ham*100)}%")
-else:
-    normalized_spam = normalized_ham = 0
-
-print("\n🎯 **Final Result:**")
-if posterior_spam > posterior_ham:
-    decision = "Spam"
-    # Confidence calculation explained
-    print(f"  P(spam | x) > P(ham | x), so email is classified as: {decision}")
+# ==================== Walkthrough ====================
+
+def main():
+    """Run the step-by-step educational example"""
+    enable_tracing(logger, logging.DEBUG)
+
+    print("\n" + "="*60)
+    print("📘 Bernoulli Naive Bayes - Educational Version")
+    print("="*60 + "\n")
+
+    # ==================== Section 1: Training Data ====================
+    print("🔹 **Section 1: Training Data**\n")
+
+    # Training data for spam and ham
+    # [presence of 'free', presence of 'win']
+    feature_names = ["free", "win"]
+    spam = [[1, 1], [1, 0], [1, 1]]
+    ham  = [[0, 0], [0, 1], [0, 0]]
+    training_data = {"spam": spam, "ham": ham}
+
+    header = "   Email | " + " | ".join(feature_names)
+    for class_name, data in training_data.items():
+        print(f"{class_name.capitalize()} training data:")
+        print(header)
+        for i, email in enumerate(data):
+            print(f"   Email{i+1} | " + " | ".join(f"{v:^{len(name)}}" for v, name in zip(email, feature_names)))
+        print()
+
+    # Test email
+    x = [1, 0]
+    print("📧 **Test Email:** " + ", ".join(f"{name}={v}" for name, v in zip(feature_names, x)))
+
+    # ==================== Section 2: Feature Probability Calculation ====================
+    print("\n" + "-"*60)
+    print("🔹 **Section 2: Feature Probability Calculation with Laplacian Smoothing**\n")
+
+    # Calculate probabilities for each feature of each class
+    feature_probs = {}
+    for class_name, data in training_data.items():
+        print(f"📊 **For {class_name.capitalize()} class:**")
+        feature_probs[class_name] = [
+            feature_probability(data, j, name, class_name) for j, name in enumerate(feature_names)
+        ]
+
+    # ==================== Section 3: Conditional Probability Calculation ====================
+    print("-"*60)
+    print("🔹 **Section 3: Calculating P(x | class)**\n")
+
+    print("Formula: P(x | class) = PRODUCT of all P(feature_i | class)")
+    print("The symbol Π (capital pi) means 'product' - multiply all terms together")
+    print("For test email: x = [" + ", ".join(f"{name}={v}" for name, v in zip(feature_names, x)) + "]")
+
+    likelihoods = {}
+    for class_name, probs in feature_probs.items():
+        print(f"\n📌 **For {class_name.capitalize()} class:**")
+        terms = []
+        for name, value, p in zip(feature_names, x, probs):
+            if value == 1:
+                terms.append(p)
+                print(f"  P({name}=1 | {class_name}) = {fmt(p)}")
+            else:
+                terms.append(1 - p)
+                print(f"  P({name}=0 | {class_name}) = 1 - P({name}=1 | {class_name}) = 1 - {fmt(p)} = {fmt(1 - p)}")
+
+        likelihoods[class_name] = math.prod(terms)
+        print(f"\n  P(x | {class_name}) = " + " × ".join(f"P({name}={v} | {class_name})" for name, v in zip(feature_names, x)))
+        print(f"              = " + " × ".join(fmt(t) for t in terms))
+        print(f"              = {fmt(likelihoods[class_name])}")
+
+    # ==================== Section 4: Prior Probabilities ====================
+    print("\n" + "-"*60)
+    print("🔹 **Section 4: Incorporating Prior Probabilities (Priors)**\n")
+
+    n_total = sum(len(data) for data in training_data.values())
+    priors = {class_name: len(data) / n_total for class_name, data in training_data.items()}
+
+    print("Prior probabilities based on training data frequency:")
+    for class_name, data in training_data.items():
+        print(f"  P({class_name}) = {len(data)} / {n_total} = {fmt(priors[class_name])}")
+
+    print("\n📌 **Calculating Posterior (without normalization):**")
+    print("  Bayes formula: P(class | x) is PROPORTIONAL TO P(x | class) × P(class)")
+    print("  The symbol ∝ means 'is proportional to' (we'll normalize later)")
+
+    posteriors = {}
+    for class_name in training_data:
+        posteriors[class_name] = likelihoods[class_name] * priors[class_name]
+        print(f"\n  For {class_name}: P({class_name} | x) ∝ P(x | {class_name}) × P({class_name})")
+        print(f"           ∝ {fmt(likelihoods[class_name])} × {fmt(priors[class_name])}")
+        print(f"           ∝ {fmt(posteriors[class_name])}")
+
+    # ==================== Section 5: Final Decision ====================
+    print("\n" + "-"*60)
+    print("🔹 **Section 5: Final Decision**\n")
+
+    print("Comparing unnormalized posterior probabilities:")
+    for class_name, posterior in posteriors.items():
+        print(f"  P({class_name} | x) ∝ {fmt(posterior)}")
+
+    print("\n📌 **Calculating normalized probabilities:**")
+    total = sum(posteriors.values())
+    print(f"  Total probability = " + " + ".join(f"P({c} | x)" for c in posteriors))
+    print(f"                     = " + " + ".join(fmt(p) for p in posteriors.values()))
+    print(f"                     = {fmt(total)}")
+
+    if total > 0:
+        for class_name, posterior in posteriors.items():
+            normalized = posterior / total
+            print(f"\n  P({class_name} | x) = P({class_name} | x) / Total")
+            print(f"               = {fmt(posterior)} / {fmt(total)}")
+            print(f"               = {fmt(normalized)}")
+            print(f"               = {fmt(normalized*100)}%")
+
+    print("\n🎯 **Final Result:**")
+    ranked = sorted(posteriors, key=posteriors.get, reverse=True)
+    decision, runner_up = ranked[0], ranked[1]
+    print(f"  P({decision} | x) is the largest, so email is classified as: {decision.capitalize()}")
+
+    # Confidence: margin between the two most probable classes
     print(f"\n  📊 **Confidence Calculation:**")
-    print(f"    Confidence = |P(spam|x) - P(ham|x)| / max(P(spam|x), P(ham|x))")
-    print(f"    Confidence = |{fmt(posterior_spam)} - {fmt(posterior_ham)}| / max({fmt(posterior_spam)}, {fmt(posterior_ham)})")
-    print(f"    Confidence = |{fmt(posterior_spam - posterior_ham)}| / {fmt(posterior_spam)}")
-    
-    confidence = abs(posterior_spam - posterior_ham) / max(posterior_spam, posterior_ham)
+    print(f"    Confidence = (P(best|x) - P(second|x)) / P(best|x)")
+    print(f"    Confidence = ({fmt(posteriors[decision])} - {fmt(posteriors[runner_up])}) / {fmt(posteriors[decision])}")
+    confidence = (posteriors[decision] - posteriors[runner_up]) / posteriors[decision]
     print(f"    Confidence = {fmt(confidence)}")
     print(f"    Confidence = {fmt(confidence*100)}%")
-    
-    print(f"\n  Decision: {decision} (higher probability of being spam)")
-    print(f"  Confidence: {fmt(confidence*100)}%")
-else:
-    decision = "Ham"
-    # Confidence calculation explained
-    print(f"  P(ham | x) > P(spam | x), so email is classified as: {decision}")
-    print(f"\n  📊 **Confidence Calculation:**")
-    print(f"    Confidence = |P(spam|x) - P(ham|x)| / max(P(spam|x), P(ham|x))")
-    print(f"    Confidence = |{fmt(posterior_spam)} - {fmt(posterior_ham)}| / max({fmt(posterior_spam)}, {fmt(posterior_ham)})")
-    print(f"    Confidence = |{fmt(posterior_spam - posterior_ham)}| / {fmt(posterior_ham)}")
-    
-    confidence = abs(posterior_spam - posterior_ham) / max(posterior_spam, posterior_ham)
-    print(f"    Confidence = {fmt(confidence)}")
-    print(f"    Confidence = {fmt(confidence*100)}%")
-    
-    print(f"\n  Decision: {decision} (higher probability of being non-spam)")
+
+    print(f"\n  Decision: {decision.capitalize()}")
     print(f"  Confidence: {fmt(confidence*100)}%")
 
-print("\n" + "="*60)
-print("✅ Bernoulli Naive Bayes training and testing completed")
-print("="*60)
\ No newline at end of file
+    # ==================== Section 6: Vectorized Engine ====================
+    print("\n" + "-"*60)
+    print("🔹 **Section 6: Same Model with the Vectorized Engine**\n")
+
+    # Any number of classes and features; trained class by class to show partial_fit
+    model = BernoulliNB(alpha=1)
+    for class_name, data in training_data.items():
+        model.partial_fit(data, [class_name] * len(data))
+    for label, p in zip(model.classes_, model.predict_proba([x])[0]):
+        print(f"  P({label} | x) = {fmt(p*100)}%")
+    print(f"  Prediction: {model.predict([x])[0].capitalize()}")
+
+    packed_x = pack_bits([x])
+    print(f"\n  Bit-packed test email: {x} -> uint64 word {packed_x[0, 0]}")
+    print(f"  Prediction from packed bits: {model.predict_packed(packed_x)[0].capitalize()}")
+
+    print("\n" + "="*60)
+    print("✅ Bernoulli Naive Bayes training and testing completed")
+    print("="*60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from Mixed import MixedNB, is_block_list
+from Multinomial import CSRMatrix, as_csr
+
+# ==================== Prediction Cache ====================
+#
+# Repeated feature vectors (templated mail, retries) are looked up instead of scored.
+# A row's key is 128 bits: two sums (mod 2^64) of a splitmix64 mix of each stored
+# (column, value) pair, computed for the whole batch at once. Dense and CSR encodings
+# of the same vector therefore share an entry. A MixedNB's list-of-blocks input is
+# hashed and row-sliced block by block. Entries belong to one model version: when
+# partial_fit/merge/set_state change the model (new version_) or a different model
+# object is passed in, the cache empties itself.
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+def _splitmix64(z):
+    z = z + _GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def _key_sums(X, column_offset=0):
+    """(n_rows x 2) uint64 sums of the mixed (column + column_offset, value) pairs of each row"""
+    X_csr = as_csr(X)
+    if X_csr is None:
+        X_csr = CSRMatrix.from_dense(X)
+    column_hash = _splitmix64(X_csr.indices.astype(np.uint64) + np.uint64(column_offset))
+    first = _splitmix64(column_hash ^ (X_csr.data + 0.0).view(np.uint64))  # + 0.0 folds -0.0 into 0.0
+    mixed = np.stack([first, _splitmix64(first ^ column_hash)], axis=1)
+    sums = np.zeros((X_csr.shape[0], 2), dtype=np.uint64)
+    nonempty = np.diff(X_csr.indptr) > 0
+    if X_csr.nnz:
+        sums[nonempty] = np.add.reduceat(mixed, X_csr.indptr[:-1][nonempty], axis=0)
+    return sums
+
+def row_keys(X, blocks=False):
+    """16-byte key of every row, from its nonzero columns and values
+
+    With blocks=True, X is a list of per-block matrices (MixedNB input); block columns
+    are numbered after the preceding blocks', so the key equals that of the joined row.
+    """
+    if blocks:
+        sums, offset = None, 0
+        for part in X:
+            part_sums = _key_sums(part, offset)
+            sums = part_sums if sums is None else sums + part_sums
+            offset += part.shape[1]
+    else:
+        sums = _key_sums(X)
+    return sums.view("V16").ravel().tolist()
+
+def take_rows(X, rows, blocks=False):
+    """Rows (any order) of a dense or CSR batch, or of every block when blocks=True"""
+    if blocks:
+        return [take_rows(part, rows) for part in X]
+    X_csr = as_csr(X)
+    if X_csr is None:
+        return np.asarray(X)[rows]
+    return X_csr.take(rows)
+
+class PredictionCache:
+    """Bounded LRU cache of per-row log posteriors in front of a model's predict methods
+
+    Hyperparameters edited in place after fitting (alpha, var_smoothing) do not
+    change version_; call clear() after such edits.
+    """
+
+    def __init__(self, model, max_size=100000):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.model = model
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._owner = None  # (model, version_) the entries were computed with
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    @property
+    def classes_(self):
+        return self.model.classes_
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._owner = None
+
+    def _check_version(self):
+        model = self.model
+        if self._owner is None or self._owner[0] is not model or self._owner[1] != model.version_:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._owner = (model, model.version_)
+
+    def predict_log_proba(self, X):
+        """Normalized log posteriors; only rows not seen under this model version are scored"""
+        # Only a MixedNB takes a list of block matrices; any other list is rows of one matrix
+        blocks = isinstance(self.model, MixedNB) and is_block_list(X)
+        if not blocks and as_csr(X) is None:
+            X = np.asarray(X)
+        keys = row_keys(X, blocks)
+        with self._lock:
+            self._check_version()
+            owner = self._owner
+            out = np.empty((len(keys), len(self.model.classes_)))
+            entries = self._entries
+            hit_rows, hit_values = [], []
+            missing = {}  # key -> rows of this batch that need it
+            for i, key in enumerate(keys):
+                cached = entries.get(key)
+                if cached is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    entries.move_to_end(key)
+                    hit_rows.append(i)
+                    hit_values.append(cached)
+            if hit_rows:
+                out[hit_rows] = hit_values
+            # A repeat within the batch is scored once and counts as a hit
+            self.misses += len(missing)
+            self.hits += len(keys) - len(missing)
+        if not missing:
+            return out
+
+        # Score each distinct missing vector once, outside the lock
+        first_rows = [rows[0] for rows in missing.values()]
+        scored = self.model.predict_log_proba(take_rows(X, first_rows, blocks))
+        with self._lock:
+            store = self._owner == owner
+            for (key, rows), row in zip(missing.items(), scored):
+                out[rows] = row
+                if store:
+                    self._entries[key] = row.copy()
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return out
+
+    def predict_proba(self, X):
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X):
+        return self.model.classes_[np.argmax(self.predict_log_proba(X), axis=1)]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"size": len(self._entries), "max_size": self.max_size, "hits": self.hits,
+                "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions, "invalidations": self.invalidations}
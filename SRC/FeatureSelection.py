@@ -0,0 +1,86 @@
+import numpy as np
+
+from Multinomial import CSRMatrix, as_csr
+
+# ==================== Vocabulary Selection ====================
+#
+# Both scores are computed from the (n_classes x V) word-count matrix the trainer
+# already keeps, so selecting features never revisits the training documents.
+#   chi2:     Σ_c (O_cw - E_cw)² / E_cw with E_cw = P(c) × (count of word w)
+#   mutual_info: Σ_c P(c, w) · log(P(c, w) / (P(c) P(w))) over token events
+
+def chi2_scores(feature_count, class_count):
+    """Chi-square statistic of every word against the class, shape (V,)"""
+    feature_count = np.asarray(feature_count, dtype=np.float64)
+    class_prob = np.asarray(class_count, dtype=np.float64) / np.sum(class_count)
+    expected = np.outer(class_prob, feature_count.sum(axis=0))
+    diff = feature_count - expected
+    terms = np.divide(diff * diff, expected, out=np.zeros_like(expected), where=expected > 0)
+    return terms.sum(axis=0)
+
+def mutual_info_scores(feature_count, class_count=None):
+    """Mutual information each word contributes between token occurrence and class, shape (V,)
+
+    Class probabilities come from token counts, so class_count is accepted but unused.
+    """
+    joint = np.asarray(feature_count, dtype=np.float64)
+    joint = joint / joint.sum()
+    p_class = joint.sum(axis=1, keepdims=True)
+    p_word = joint.sum(axis=0, keepdims=True)
+    expected = p_class * p_word
+    ratio = np.divide(joint, expected, out=np.ones_like(joint), where=joint > 0)
+    return (joint * np.log(ratio)).sum(axis=0)
+
+SCORERS = {"chi2": chi2_scores, "mutual_info": mutual_info_scores}
+
+class FeatureMap:
+    """Maps columns of the full vocabulary onto the selected subset (dropped columns -> -1)"""
+
+    def __init__(self, selected, n_features):
+        self.selected_ = np.asarray(selected, dtype=np.int64)
+        self.n_features_in = n_features
+        self.index_ = np.full(n_features, -1, dtype=np.int64)
+        self.index_[self.selected_] = np.arange(len(self.selected_))
+
+    @property
+    def n_features_out(self):
+        return len(self.selected_)
+
+    def transform(self, X):
+        """Keep only the selected columns of a dense or CSR batch, renumbered for the compact model"""
+        X_csr = as_csr(X)
+        if X_csr is None:
+            return np.asarray(X)[:, self.selected_]
+        # Columns beyond the original vocabulary (added later) are dropped too
+        new_index = np.full(len(X_csr.indices), -1, dtype=np.int64)
+        known = X_csr.indices < self.n_features_in
+        new_index[known] = self.index_[X_csr.indices[known]]
+        keep = new_index >= 0
+        kept_before = np.concatenate(([0], np.cumsum(keep)))
+        return CSRMatrix(X_csr.data[keep], new_index[keep], kept_before[X_csr.indptr],
+                         (X_csr.shape[0], self.n_features_out))
+
+    def remap_vocabulary(self, vocabulary):
+        """{token: compact column} for the tokens of a {token: column} vocabulary that were kept"""
+        return {token: int(self.index_[j]) for token, j in vocabulary.items()
+                if j < self.n_features_in and self.index_[j] >= 0}
+
+def select_features(model, k=None, threshold=None, score="chi2"):
+    """Compact copy of a fitted MultinomialNB over its most class-informative words
+
+    Keeps the k best-scoring words, or every word scoring at least threshold (both:
+    the k best of those above threshold). Returns (compact_model, feature_map, scores);
+    feature_map.transform turns full-vocabulary documents into compact-model input.
+    """
+    if k is None and threshold is None:
+        raise ValueError("pass k, threshold or both")
+    if score not in SCORERS:
+        raise ValueError(f"score must be one of {tuple(SCORERS)}, got {score!r}")
+    scores = SCORERS[score](model.feature_count_, model.class_count_)
+
+    candidates = np.arange(len(scores)) if threshold is None else np.flatnonzero(scores >= threshold)
+    if k is not None and k < len(candidates):
+        best = np.argpartition(-scores[candidates], k - 1)[:k]
+        candidates = candidates[best]
+    selected = np.sort(candidates)
+    return model.subset_features(selected), FeatureMap(selected, len(scores)), scores
@@ -1,44 +1,242 @@
+import logging
 import math
+
 import numpy as np
 
+from Instrumentation import enable_tracing, phase
+from Multinomial import log_sum_exp
+from Versions import next_version
+
 def fmt(x):
     """Format numbers for better display"""
     return f"{x:.4f}"
 
-print("\n" + "="*80)
-print("📘 Gaussian Naive Bayes - Educational Version (For Continuous Data)")
-print("="*80 + "\n")
+# ==================== Streaming Parameter Estimation ====================
+
+class GaussianStats:
+    """Per-class, per-feature count / mean / M2 that can be updated in chunks and merged
+
+    Each chunk is reduced in one vectorized pass and folded in with Chan's parallel
+    formula, so the full dataset never has to be in memory at once.
+    """
+
+    def __init__(self):
+        self.classes_ = None
+
+    def update(self, X, y):
+        """Fold an (n_samples x k) chunk with its labels into the running statistics"""
+        with phase("gaussian", "counting", X) as timer:
+            X = np.asarray(X, dtype=np.float64)
+            classes, y_idx = np.unique(np.asarray(y), return_inverse=True)
+            Y = np.zeros((X.shape[0], len(classes)))
+            Y[np.arange(X.shape[0]), y_idx] = 1
+
+            count = Y.sum(axis=0)
+            mean = (Y.T @ X) / count[:, np.newaxis]
+            centered = X - mean[y_idx]
+            m2 = Y.T @ (centered * centered)
+            timer.allocated(X, Y, centered)
+            return self._merge(classes, count, mean, m2)
+
+    def merge(self, other):
+        """Combine statistics gathered separately (other chunks, other workers)"""
+        if other.classes_ is None:
+            return self
+        return self._merge(other.classes_, other.count_, other.mean_, other.m2_)
+
+    def _merge(self, classes, count, mean, m2):
+        if self.classes_ is None:
+            self.classes_ = classes
+            self.count_, self.mean_, self.m2_ = count.copy(), mean.copy(), m2.copy()
+            return self
+
+        if mean.shape[1] != self.mean_.shape[1]:
+            raise ValueError(f"got {mean.shape[1]} features, expected {self.mean_.shape[1]}")
+        all_classes = np.union1d(self.classes_, classes)
+        if len(all_classes) != len(self.classes_):
+            old = np.searchsorted(all_classes, self.classes_)
+            k = self.mean_.shape[1]
+            grown_count = np.zeros(len(all_classes))
+            grown_mean, grown_m2 = np.zeros((len(all_classes), k)), np.zeros((len(all_classes), k))
+            grown_count[old], grown_mean[old], grown_m2[old] = self.count_, self.mean_, self.m2_
+            self.classes_, self.count_, self.mean_, self.m2_ = all_classes, grown_count, grown_mean, grown_m2
+
+        rows = np.searchsorted(self.classes_, classes)
+        n_a = self.count_[rows][:, np.newaxis]
+        n_b = count[:, np.newaxis]
+        n = n_a + n_b
+        # Chan et al.: δ = μ_b - μ_a, μ = μ_a + δ·n_b/n, M2 = M2_a + M2_b + δ²·n_a·n_b/n
+        delta = mean - self.mean_[rows]
+        self.mean_[rows] += delta * (n_b / n)
+        self.m2_[rows] += m2 + delta * delta * (n_a * n_b / n)
+        self.count_[rows] = n[:, 0]
+        return self
+
+    @property
+    def var_(self):
+        """Population variance Σ(x_i - μ)²/n, matching np.var"""
+        return self.m2_ / self.count_[:, np.newaxis]
+
+    @property
+    def std_(self):
+        return np.sqrt(self.var_)
+
+# Variance given to features that are constant within a class (σ = 0.0001)
+MIN_VARIANCE = 0.0001 ** 2
+LOG_2PI = math.log(2 * math.pi)
+SQRT_2PI = math.sqrt(2 * math.pi)
+
+class GaussianNB:
+    """Gaussian Naive Bayes scored entirely in log space for whole batches
+
+    var_smoothing adds var_smoothing × (largest feature variance) to every variance
+    for stability; variances that are still zero are floored at MIN_VARIANCE.
+    """
+
+    def __init__(self, var_smoothing=0.0):
+        self.var_smoothing = var_smoothing
+        self.stats_ = GaussianStats()
+        self.classes_ = None
+        self._constants = None
+        self.version_ = 0
 
-# ==================== Section 1: Training Data ====================
-print("🔹 **Section 1: Training Data**\n")
+    def fit(self, X, y):
+        """Learn per-class means, standard deviations and priors"""
+        self.stats_ = GaussianStats().update(X, y)
+        return self._invalidate()
 
-# Training data for classifying fruits based on weight and sugar content
-# [weight (grams), sugar_content (%)]
-apple = [[150, 12], [160, 11], [170, 13], [155, 12.5]]
-banana = [[120, 18], [130, 19], [125, 17.5], [135, 18.5]]
+    def partial_fit(self, X, y):
+        """Fold another chunk into the statistics; scoring constants are rebuilt on next use"""
+        self.stats_.update(X, y)
+        return self._invalidate()
 
-print("Apple training data (class 1):")
-print("   Fruit  | Weight(g) | Sugar(%)")
-for i, fruit in enumerate(apple):
-    print(f"   Apple{i+1} |    {fruit[0]}     |    {fruit[1]}")
+    def merge(self, other):
+        """Combine with a model trained on other data (e.g. another shard)"""
+        self.stats_.merge(other.stats_)
+        return self._invalidate()
 
-print("\nBanana training data (class 2):")
-print("   Fruit   | Weight(g) | Sugar(%)")
-for i, fruit in enumerate(banana):
-    print(f"   Banana{i+1} |    {fruit[0]}     |    {fruit[1]}")
+    def get_state(self):
+        """Arrays that fully describe the fitted model, for saving"""
+        return {"count": self.stats_.count_, "mean": self.stats_.mean_, "m2": self.stats_.m2_}
 
-# Test fruit
-x_test = [140, 15]
-print(f"\n🍎 **Test Fruit:** weight={x_test[0]}g, sugar_content={x_test[1]}%")
+    def set_state(self, classes, arrays):
+        """Restore a fitted model from get_state() arrays (which may be memory-mapped)"""
+        self.stats_ = GaussianStats()
+        self.stats_.classes_ = np.asarray(classes)
+        self.stats_.count_, self.stats_.mean_, self.stats_.m2_ = arrays["count"], arrays["mean"], arrays["m2"]
+        return self._invalidate()
 
-# ==================== Section 2: Calculating Gaussian Parameters ====================
-print("\n" + "-"*80)
-print("🔹 **Section 2: Calculating Gaussian Distribution Parameters**\n")
+    def _invalidate(self):
+        self.classes_ = self.stats_.classes_
+        self._constants = None
+        self.version_ = next_version()
+        return self
 
-def calculate_gaussian_params(data, class_name, feature_names):
+    def _scoring_constants(self):
+        """Per-class constants so scoring is a pair of matrix products, cached until the fit changes
+
+        log f(x; μ, σ) = -½·log(2π) - log σ - (x - μ)²/(2σ²), and expanding the square gives
+        Σ_j (x_j - μ_j)²/(2σ_j²) = x²·a - x·(2μa) + μ²·a with a = 1/(2σ²).
+        """
+        cached = self._constants
+        if cached is not None and cached["var_smoothing"] == self.var_smoothing:
+            return cached
+
+        stats = self.stats_
+        with phase("gaussian", "smoothing") as timer:
+            var = stats.var_
+            if self.var_smoothing:
+                var = var + self.var_smoothing * var.max()
+            var = np.where(var == 0, MIN_VARIANCE, var)  # Prevent division by zero
+            timer.allocated(var)
+
+        with phase("gaussian", "log_table") as timer:
+            theta = stats.mean_
+            # Shift features to the overall mean so the expanded square does not cancel badly
+            shift = (stats.count_ @ theta) / stats.count_.sum()
+            centered = theta - shift
+            log_sigma = 0.5 * np.log(var)
+            inv_two_var = 1 / (2 * var)
+            two_mu_inv_two_var = 2 * centered * inv_two_var
+            class_log_prior = np.log(stats.count_) - np.log(stats.count_.sum())
+            # The part of log P(x | c) that does not depend on x
+            feature_const = (
+                -0.5 * LOG_2PI * var.shape[1]
+                - log_sigma.sum(axis=1)
+                - (centered * centered * inv_two_var).sum(axis=1)
+            )
+            timer.allocated(log_sigma, inv_two_var, two_mu_inv_two_var)
+
+        self._constants = {
+            "var_smoothing": self.var_smoothing, "var": var, "log_sigma": log_sigma,
+            "shift": shift, "inv_two_var": inv_two_var, "two_mu_inv_two_var": two_mu_inv_two_var,
+            "class_log_prior": class_log_prior, "feature_const": feature_const,
+        }
+        return self._constants
+
+    @property
+    def theta_(self):
+        """Per-class feature means, shape (n_classes x n_features)"""
+        return self.stats_.mean_
+
+    @property
+    def var_(self):
+        """Smoothed per-class feature variances used for scoring"""
+        return self._scoring_constants()["var"]
+
+    @property
+    def sigma_(self):
+        return np.sqrt(self.var_)
+
+    @property
+    def class_log_prior_(self):
+        return self._scoring_constants()["class_log_prior"]
+
+    def log_likelihood(self, X, out=None):
+        """log(P(x | class)) without the class prior, written into out when given"""
+        const = self._scoring_constants()
+        fresh = out is None
+        with phase("gaussian", "likelihood", X) as timer:
+            X = np.asarray(X, dtype=np.float64) - const["shift"]
+            out = np.matmul(X, const["two_mu_inv_two_var"].T, out=out)
+            X *= X
+            out -= X @ const["inv_two_var"].T
+            out += const["feature_const"]
+            timer.allocated(X)
+            if fresh:
+                timer.allocated(out)
+            return out
+
+    def joint_log_likelihood(self, X):
+        """log(P(x | class)) + log(P(class)), shape (n_samples x n_classes)"""
+        jll = self.log_likelihood(X)
+        jll += self._scoring_constants()["class_log_prior"]
+        return jll
+
+    def predict_log_proba(self, X):
+        """Normalized log posteriors via log-sum-exp"""
+        jll = self.joint_log_likelihood(X)
+        with phase("gaussian", "normalization", jll) as timer:
+            log_proba = jll - log_sum_exp(jll, axis=1)[:, np.newaxis]
+            timer.allocated(log_proba)
+            return log_proba
+
+    def predict_proba(self, X):
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X):
+        """Most probable class label for each sample"""
+        return self.classes_[np.argmax(self.joint_log_likelihood(X), axis=1)]
+
+# ==================== Step-by-Step Calculations ====================
+
+logger = logging.getLogger(__name__)
+
+def calculate_gaussian_params(data, class_name, feature_names=None):
     """Calculate mean and standard deviation for each feature"""
     n = len(data)
     k = len(data[0])  # number of features
+    feature_names = feature_names or [f"feature{j+1}" for j in range(k)]
     
     means = []
     stds = []
@@ -51,129 +249,188 @@ def calculate_gaussian_params(data, class_name, feature_names):
         means.append(mean_val)
         stds.append(std_val)
         
-        print(f"📊 **For {class_name} - {feature_names[j]}:**")
-        print(f"  Feature values: {feature_values}")
-        print(f"  Mean (μ_{class_name[0].lower()}{j+1}) = Σx_i / n = {sum(feature_values)} / {n} = {fmt(mean_val)}")
-        print(f"  Standard Deviation (σ_{class_name[0].lower()}{j+1}) = √[Σ(x_i - μ)²/(n-1)] = {fmt(std_val)}")
-        print()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"📊 **For {class_name} - {feature_names[j]}:**")
+            logger.debug(f"  Feature values: {feature_values}")
+            logger.info(f"  Mean (μ_{class_name[0].lower()}{j+1}) = Σx_i / n = {sum(feature_values)} / {n} = {fmt(mean_val)}")
+            logger.info(f"  Standard Deviation (σ_{class_name[0].lower()}{j+1}) = √[Σ(x_i - μ)²/(n-1)] = {fmt(std_val)}")
+            logger.info("")
     
     return means, stds
 
-feature_names = ["Weight", "Sugar Content"]
-apple_means, apple_stds = calculate_gaussian_params(apple, "Apple", feature_names)
-banana_means, banana_stds = calculate_gaussian_params(banana, "Banana", feature_names)
-
-# ==================== Section 3: Gaussian Probability Density Function ====================
-print("-"*80)
-print("🔹 **Section 3: Gaussian Probability Density Function (PDF)**\n")
-
 def gaussian_pdf(x, mean, std):
     """Calculate Gaussian PDF with explanation"""
     if std == 0:
         std = 0.0001  # Prevent division by zero
     
     exponent = -((x - mean) ** 2) / (2 * (std ** 2))
-    coefficient = 1 / (std * math.sqrt(2 * math.pi))
+    coefficient = 1 / (std * SQRT_2PI)
     pdf_value = coefficient * math.exp(exponent)
     
-    print(f"  Gaussian PDF formula: f(x; μ, σ) = (1/(σ√(2π))) * e^(-(x-μ)²/(2σ²))")
-    print(f"  Where:")
-    print(f"    μ = {fmt(mean)} (mean)")
-    print(f"    σ = {fmt(std)} (standard deviation)")
-    print(f"    x = {x} (feature value)")
-    print(f"  Calculation:")
-    print(f"    (x - μ)² = ({x} - {fmt(mean)})² = {fmt((x - mean) ** 2)}")
-    print(f"    2σ² = 2 * ({fmt(std)})² = {fmt(2 * (std ** 2))}")
-    print(f"    Exponent = -{fmt((x - mean) ** 2)} / {fmt(2 * (std ** 2))} = {fmt(exponent)}")
-    print(f"    e^(exponent) = e^({fmt(exponent)}) = {fmt(math.exp(exponent))}")
-    print(f"    Coefficient = 1 / ({fmt(std)} * √(2π)) = 1 / ({fmt(std)} * {fmt(math.sqrt(2 * math.pi))})")
-    print(f"    Coefficient = 1 / {fmt(std * math.sqrt(2 * math.pi))} = {fmt(coefficient)}")
-    print(f"    PDF = {fmt(coefficient)} * {fmt(math.exp(exponent))} = {fmt(pdf_value)}")
-    print()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"  Gaussian PDF formula: f(x; μ, σ) = (1/(σ√(2π))) * e^(-(x-μ)²/(2σ²))")
+        logger.debug(f"  Where:")
+        logger.debug(f"    μ = {fmt(mean)} (mean)")
+        logger.debug(f"    σ = {fmt(std)} (standard deviation)")
+        logger.debug(f"    x = {x} (feature value)")
+        logger.debug(f"  Calculation:")
+        logger.debug(f"    (x - μ)² = ({x} - {fmt(mean)})² = {fmt((x - mean) ** 2)}")
+        logger.debug(f"    2σ² = 2 * ({fmt(std)})² = {fmt(2 * (std ** 2))}")
+        logger.debug(f"    Exponent = -{fmt((x - mean) ** 2)} / {fmt(2 * (std ** 2))} = {fmt(exponent)}")
+        logger.debug(f"    e^(exponent) = e^({fmt(exponent)}) = {fmt(math.exp(exponent))}")
+        logger.debug(f"    Coefficient = 1 / ({fmt(std)} * √(2π)) = 1 / ({fmt(std)} * {fmt(SQRT_2PI)})")
+        logger.debug(f"    Coefficient = 1 / {fmt(std * SQRT_2PI)} = {fmt(coefficient)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"    PDF = {fmt(coefficient)} * {fmt(math.exp(exponent))} = {fmt(pdf_value)}")
+        logger.info("")
     
     return pdf_value
 
-print("📌 **Calculating P(x | Apple) using Gaussian PDF:**")
-p_x_apple = 1.0
-for i, (x_val, mean, std) in enumerate(zip(x_test, apple_means, apple_stds)):
-    print(f"\n  For feature '{feature_names[i]}' = {x_val}:")
-    pdf_val = gaussian_pdf(x_val, mean, std)
-    p_x_apple *= pdf_val
-
-print(f"📊 **P(x | Apple) = PRODUCT of individual feature probabilities:**")
-print(f"                 = {fmt(p_x_apple)}")
-
-print("\n" + "="*40)
-print("📌 **Calculating P(x | Banana) using Gaussian PDF:**")
-p_x_banana = 1.0
-for i, (x_val, mean, std) in enumerate(zip(x_test, banana_means, banana_stds)):
-    print(f"\n  For feature '{feature_names[i]}' = {x_val}:")
-    pdf_val = gaussian_pdf(x_val, mean, std)
-    p_x_banana *= pdf_val
-
-print(f"📊 **P(x | Banana) = PRODUCT of individual feature probabilities:**")
-print(f"                  = {fmt(p_x_banana)}")
-
-# ==================== Section 4: Prior Probabilities ====================
-print("\n" + "-"*80)
-print("🔹 **Section 4: Incorporating Prior Probabilities**\n")
-
-n_apple = len(apple)
-n_banana = len(banana)
-n_total = n_apple + n_banana
-
-p_apple_prior = n_apple / n_total
-p_banana_prior = n_banana / n_total
-
-print(f"Prior probabilities based on training data frequency:")
-print(f"  Total fruits: {n_total}")
-print(f"  Apples: {n_apple}, Bananas: {n_banana}")
-print(f"  P(Apple) = n_apple / n_total = {n_apple} / {n_total} = {fmt(p_apple_prior)}")
-print(f"  P(Banana) = n_banana / n_total = {n_banana} / {n_total} = {fmt(p_banana_prior)}")
-
-# ==================== Section 5: Posterior Calculation ====================
-print("\n" + "-"*80)
-print("🔹 **Section 5: Calculating Posterior Probabilities**\n")
-
-print("Bayes Theorem: P(class | x) = P(x | class) × P(class) / P(x)")
-print("Where P(x) = P(x | Apple)×P(Apple) + P(x | Banana)×P(Banana)")
-
-posterior_apple = p_x_apple * p_apple_prior
-posterior_banana = p_x_banana * p_banana_prior
-p_x_total = posterior_apple + posterior_banana
-
-print(f"\n📊 **Unnormalized Posteriors:**")
-print(f"  P(Apple | x) ∝ P(x | Apple) × P(Apple) = {fmt(p_x_apple)} × {fmt(p_apple_prior)} = {fmt(posterior_apple)}")
-print(f"  P(Banana | x) ∝ P(x | Banana) × P(Banana) = {fmt(p_x_banana)} × {fmt(p_banana_prior)} = {fmt(posterior_banana)}")
-print(f"  P(x) = {fmt(posterior_apple)} + {fmt(posterior_banana)} = {fmt(p_x_total)}")
-
-if p_x_total > 0:
-    p_apple_given_x = posterior_apple / p_x_total
-    p_banana_given_x = posterior_banana / p_x_total
+# ==================== Walkthrough ====================
+
+def main():
+    """Run the step-by-step educational example"""
+    enable_tracing(logger, logging.DEBUG)
+
+    print("\n" + "="*80)
+    print("📘 Gaussian Naive Bayes - Educational Version (For Continuous Data)")
+    print("="*80 + "\n")
+
+    # ==================== Section 1: Training Data ====================
+    print("🔹 **Section 1: Training Data**\n")
+
+    # Training data for classifying fruits based on weight and sugar content
+    # [weight (grams), sugar_content (%)]
+    apple = [[150, 12], [160, 11], [170, 13], [155, 12.5]]
+    banana = [[120, 18], [130, 19], [125, 17.5], [135, 18.5]]
+
+    print("Apple training data (class 1):")
+    print("   Fruit  | Weight(g) | Sugar(%)")
+    for i, fruit in enumerate(apple):
+        print(f"   Apple{i+1} |    {fruit[0]}     |    {fruit[1]}")
+
+    print("\nBanana training data (class 2):")
+    print("   Fruit   | Weight(g) | Sugar(%)")
+    for i, fruit in enumerate(banana):
+        print(f"   Banana{i+1} |    {fruit[0]}     |    {fruit[1]}")
+
+    # Test fruit
+    x_test = [140, 15]
+    print(f"\n🍎 **Test Fruit:** weight={x_test[0]}g, sugar_content={x_test[1]}%")
+
+    # ==================== Section 2: Calculating Gaussian Parameters ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 2: Calculating Gaussian Distribution Parameters**\n")
+
+    feature_names = ["Weight", "Sugar Content"]
+    apple_means, apple_stds = calculate_gaussian_params(apple, "Apple", feature_names)
+    banana_means, banana_stds = calculate_gaussian_params(banana, "Banana", feature_names)
+
+    # ==================== Section 3: Gaussian Probability Density Function ====================
+    print("-"*80)
+    print("🔹 **Section 3: Gaussian Probability Density Function (PDF)**\n")
+
+    print("📌 **Calculating P(x | Apple) using Gaussian PDF:**")
+    p_x_apple = 1.0
+    for i, (x_val, mean, std) in enumerate(zip(x_test, apple_means, apple_stds)):
+        print(f"\n  For feature '{feature_names[i]}' = {x_val}:")
+        pdf_val = gaussian_pdf(x_val, mean, std)
+        p_x_apple *= pdf_val
+
+    print(f"📊 **P(x | Apple) = PRODUCT of individual feature probabilities:**")
+    print(f"                 = {fmt(p_x_apple)}")
+
+    print("\n" + "="*40)
+    print("📌 **Calculating P(x | Banana) using Gaussian PDF:**")
+    p_x_banana = 1.0
+    for i, (x_val, mean, std) in enumerate(zip(x_test, banana_means, banana_stds)):
+        print(f"\n  For feature '{feature_names[i]}' = {x_val}:")
+        pdf_val = gaussian_pdf(x_val, mean, std)
+        p_x_banana *= pdf_val
+
+    print(f"📊 **P(x | Banana) = PRODUCT of individual feature probabilities:**")
+    print(f"                  = {fmt(p_x_banana)}")
+
+    # ==================== Section 4: Prior Probabilities ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 4: Incorporating Prior Probabilities**\n")
+
+    n_apple = len(apple)
+    n_banana = len(banana)
+    n_total = n_apple + n_banana
+
+    p_apple_prior = n_apple / n_total
+    p_banana_prior = n_banana / n_total
+
+    print(f"Prior probabilities based on training data frequency:")
+    print(f"  Total fruits: {n_total}")
+    print(f"  Apples: {n_apple}, Bananas: {n_banana}")
+    print(f"  P(Apple) = n_apple / n_total = {n_apple} / {n_total} = {fmt(p_apple_prior)}")
+    print(f"  P(Banana) = n_banana / n_total = {n_banana} / {n_total} = {fmt(p_banana_prior)}")
+
+    # ==================== Section 5: Posterior Calculation ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 5: Calculating Posterior Probabilities**\n")
+
+    print("Bayes Theorem: P(class | x) = P(x | class) × P(class) / P(x)")
+    print("Where P(x) = P(x | Apple)×P(Apple) + P(x | Banana)×P(Banana)")
+
+    posterior_apple = p_x_apple * p_apple_prior
+    posterior_banana = p_x_banana * p_banana_prior
+    p_x_total = posterior_apple + posterior_banana
+
+    print(f"\n📊 **Unnormalized Posteriors:**")
+    print(f"  P(Apple | x) ∝ P(x | Apple) × P(Apple) = {fmt(p_x_apple)} × {fmt(p_apple_prior)} = {fmt(posterior_apple)}")
+    print(f"  P(Banana | x) ∝ P(x | Banana) × P(Banana) = {fmt(p_x_banana)} × {fmt(p_banana_prior)} = {fmt(posterior_banana)}")
+    print(f"  P(x) = {fmt(posterior_apple)} + {fmt(posterior_banana)} = {fmt(p_x_total)}")
+
+    if p_x_total > 0:
+        p_apple_given_x = posterior_apple / p_x_total
+        p_banana_given_x = posterior_banana / p_x_total
     
-    print(f"\n📊 **Normalized Posteriors:**")
-    print(f"  P(Apple | x) = {fmt(posterior_apple)} / {fmt(p_x_total)} = {fmt(p_apple_given_x)}")
-    print(f"  P(Banana | x) = {fmt(posterior_banana)} / {fmt(p_x_total)} = {fmt(p_banana_given_x)}")
-
-# ==================== Section 6: Final Decision ====================
-print("\n" + "-"*80)
-print("🔹 **Section 6: Final Decision**\n")
-
-print("🎯 **Probability Comparison:**")
-print(f"  P(Apple | x)  = {fmt(p_apple_given_x)} = {fmt(p_apple_given_x*100)}%")
-print(f"  P(Banana | x) = {fmt(p_banana_given_x)} = {fmt(p_banana_given_x*100)}%")
-
-if p_apple_given_x > p_banana_given_x:
-    decision = "Apple"
-    confidence = (p_apple_given_x - p_banana_given_x) / p_apple_given_x
-else:
-    decision = "Banana"
-    confidence = (p_banana_given_x - p_apple_given_x) / p_banana_given_x
-
-print(f"\n✅ **Final Classification:** {decision}")
-print(f"   Confidence: {fmt(confidence*100)}%")
-print(f"   Weight: {x_test[0]}g, Sugar: {x_test[1]}%")
-
-print("\n" + "="*80)
-print("✅ Gaussian Naive Bayes Classification Completed")
-print("="*80)
\ No newline at end of file
+        print(f"\n📊 **Normalized Posteriors:**")
+        print(f"  P(Apple | x) = {fmt(posterior_apple)} / {fmt(p_x_total)} = {fmt(p_apple_given_x)}")
+        print(f"  P(Banana | x) = {fmt(posterior_banana)} / {fmt(p_x_total)} = {fmt(p_banana_given_x)}")
+
+    # ==================== Section 6: Final Decision ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 6: Final Decision**\n")
+
+    print("🎯 **Probability Comparison:**")
+    print(f"  P(Apple | x)  = {fmt(p_apple_given_x)} = {fmt(p_apple_given_x*100)}%")
+    print(f"  P(Banana | x) = {fmt(p_banana_given_x)} = {fmt(p_banana_given_x*100)}%")
+
+    if p_apple_given_x > p_banana_given_x:
+        decision = "Apple"
+        confidence = (p_apple_given_x - p_banana_given_x) / p_apple_given_x
+    else:
+        decision = "Banana"
+        confidence = (p_banana_given_x - p_apple_given_x) / p_banana_given_x
+
+    print(f"\n✅ **Final Classification:** {decision}")
+    print(f"   Confidence: {fmt(confidence*100)}%")
+    print(f"   Weight: {x_test[0]}g, Sugar: {x_test[1]}%")
+
+    # ==================== Section 7: Streaming Parameter Estimation ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 7: Same Parameters from Chunks (Welford/Chan)**\n")
+
+    # Two "workers" each see half of every class, then merge their statistics
+    worker_a = GaussianStats().update(apple[:2] + banana[:2], ["Apple"] * 2 + ["Banana"] * 2)
+    worker_b = GaussianStats().update(apple[2:] + banana[2:], ["Apple"] * 2 + ["Banana"] * 2)
+    stats = worker_a.merge(worker_b)
+    for c, label in enumerate(stats.classes_):
+        for j, name in enumerate(feature_names):
+            print(f"  {label} - {name}: μ = {fmt(stats.mean_[c, j])}, σ = {fmt(stats.std_[c, j])}")
+
+    model = GaussianNB().fit(apple + banana, ["Apple"] * n_apple + ["Banana"] * n_banana)
+    print(f"\n  Batched log-space scoring of the test fruit:")
+    for label, log_p in zip(model.classes_, model.predict_log_proba([x_test])[0]):
+        print(f"  log(P({label} | x)) = {fmt(log_p)}  ->  P = {fmt(math.exp(log_p)*100)}%")
+
+    print("\n" + "="*80)
+    print("✅ Gaussian Naive Bayes Classification Completed")
+    print("="*80)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import logging
+import sys
+import threading
+import time
+
+# ==================== Hot-Path Instrumentation ====================
+#
+# The models wrap each phase of fit/predict in `with phase(variant, name, X) as timer:`.
+# While disabled, phase() returns one shared no-op object, so the cost is a flag
+# check and an empty with-block per call (per batch, never per row).
+#
+# Phases: counting, smoothing, log_table, likelihood, normalization.
+
+_lock = threading.Lock()
+_enabled = False
+_stats = {}
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+def _n_rows(X):
+    if X is None:
+        return 0
+    shape = getattr(X, "shape", None)
+    return shape[0] if shape else len(X)
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def allocated(self, *arrays):
+        pass
+
+_NULL_PHASE = _NullPhase()
+
+class _Phase:
+    __slots__ = ("key", "rows", "nbytes", "start")
+
+    def __init__(self, key, rows):
+        self.key, self.rows, self.nbytes = key, rows, 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        with _lock:
+            entry = _stats.setdefault(self.key, [0, 0.0, 0, 0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] += self.rows
+            entry[3] += self.nbytes
+        return False
+
+    def allocated(self, *arrays):
+        """Count the bytes of arrays this phase created"""
+        self.nbytes += sum(getattr(a, "nbytes", 0) for a in arrays)
+
+def phase(variant, name, X=None):
+    """Context manager timing one phase; X (optional) supplies the row count"""
+    if not _enabled:
+        return _NULL_PHASE
+    return _Phase((variant, name), _n_rows(X))
+
+def as_dict():
+    """{variant: {phase: {calls, seconds, rows, rows_per_sec, allocated_bytes}}}"""
+    with _lock:
+        items = [(key, list(entry)) for key, entry in _stats.items()]
+    report = {}
+    for (variant, name), (calls, seconds, rows, nbytes) in sorted(items):
+        report.setdefault(variant, {})[name] = {
+            "calls": calls, "seconds": seconds, "rows": rows,
+            "rows_per_sec": rows / seconds if rows and seconds > 0 else None,
+            "allocated_bytes": nbytes,
+        }
+    return report
+
+_PROMETHEUS_METRICS = (
+    ("nb_phase_calls_total", "Number of times the phase ran", "calls"),
+    ("nb_phase_seconds_total", "Wall-clock seconds spent in the phase", "seconds"),
+    ("nb_phase_rows_total", "Rows processed by the phase", "rows"),
+    ("nb_phase_allocated_bytes_total", "Bytes of arrays allocated by the phase", "allocated_bytes"),
+)
+
+def to_prometheus():
+    """Counters in the Prometheus text exposition format"""
+    report = as_dict()
+    lines = []
+    for metric, help_text, field in _PROMETHEUS_METRICS:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for variant, phases in report.items():
+            for name, values in phases.items():
+                lines.append(f'{metric}{{variant="{variant}",phase="{name}"}} {values[field]}')
+    return "\n".join(lines) + "\n"
+
+# ==================== Walkthrough Tracing ====================
+
+def enable_tracing(logger, level=logging.INFO, stream=None):
+    """Show a walkthrough logger's explanation of each calculation (INFO: results, DEBUG: every step)
+
+    Calling it again reuses the handler it added, so running a walkthrough twice in one
+    process does not print every line twice.
+    """
+    for handler in logger.handlers:
+        if getattr(handler, "walkthrough", False):
+            break
+    else:
+        handler = logging.StreamHandler()
+        handler.walkthrough = True
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    handler.setStream(stream or sys.stdout)
+    logger.setLevel(level)
+    logger.propagate = False
+    return handler
@@ -0,0 +1,169 @@
+import argparse
+import itertools
+import queue
+import threading
+
+import numpy as np
+
+from Serialization import MODEL_KINDS, save_model
+
+# ==================== Out-of-Core Training Data ====================
+#
+# Every loader yields (X_chunk, y_chunk) pairs of at most chunk_size rows, so memory
+# use is bounded by one chunk (times the read-ahead depth) however large the file is.
+# Text corpora already stream through Multinomial.read_labeled_lines and
+# StreamingVectorizer.iter_batches; read_ahead() and fit_chunks() work on those too.
+
+def iter_npy_chunks(X_path, y_path=None, chunk_size=65536, label_column=None):
+    """Chunks of a memory-mapped .npy feature array
+
+    Labels come from the .npy file y_path, or from column label_column of the
+    feature array when both were saved in one file. Only the current chunk is
+    copied out of the mapping.
+    """
+    X = np.load(X_path, mmap_mode="r")
+    if X.ndim != 2:
+        raise ValueError(f"{X_path} holds a {X.ndim}-d array; expected (n_samples x n_features)")
+    if y_path is not None:
+        y = np.load(y_path, mmap_mode="r")
+        if len(y) != len(X):
+            raise ValueError(f"{y_path} has {len(y)} labels for {len(X)} rows")
+    elif label_column is None:
+        raise ValueError("pass y_path or label_column")
+    else:
+        label_column %= X.shape[1]
+        feature_columns = np.delete(np.arange(X.shape[1]), label_column)
+
+    for start in range(0, X.shape[0], chunk_size):
+        stop = start + chunk_size
+        if y_path is not None:
+            yield np.array(X[start:stop]), np.array(y[start:stop])
+        else:
+            block = X[start:stop]
+            yield np.asarray(block[:, feature_columns]), np.array(block[:, label_column])
+
+def iter_csv_chunks(path, label_column=-1, chunk_size=65536, sep=None, header=False,
+                    dtype=np.float64, encoding="utf-8", label_dtype=np.float64):
+    """Chunks of a delimited text file: one sample per line, numeric features plus a label column
+
+    sep defaults to a tab for .tsv/.tab files and a comma otherwise. Fields are split
+    on sep only (no quoting). Labels are parsed as label_dtype: float by default, like
+    iter_npy_chunks, so both loaders give the same classes_; pass str for text labels.
+    Each line is parsed once, features and label together.
+    """
+    if sep is None:
+        sep = "\t" if str(path).endswith((".tsv", ".tab")) else ","
+    text_labels = np.dtype(label_dtype).kind in "USO"
+    with open(path, encoding=encoding) as f:
+        if header:
+            next(f, None)
+        feature_columns = row_dtype = None
+        while True:
+            raw = list(itertools.islice(f, chunk_size))
+            if not raw:
+                return
+            lines = [line for line in raw if line.strip()]
+            if not lines:
+                continue
+            if feature_columns is None:
+                n_columns = lines[0].count(sep) + 1
+                label_column %= n_columns
+                feature_columns = [j for j in range(n_columns) if j != label_column]
+                # Text labels: one record per line of (features, label), label read last
+                row_dtype = [("X", dtype, (n_columns - 1,)), ("y", object)]
+            if text_labels:
+                rows = np.loadtxt(lines, delimiter=sep, usecols=feature_columns + [label_column],
+                                  dtype=row_dtype, ndmin=1)
+                yield np.ascontiguousarray(rows["X"]), rows["y"].astype(label_dtype)
+            else:
+                table = np.loadtxt(lines, delimiter=sep, dtype=np.result_type(dtype, label_dtype), ndmin=2)
+                yield table[:, feature_columns].astype(dtype, copy=False), table[:, label_column].astype(label_dtype)
+
+# ==================== Background Read-Ahead ====================
+
+_DONE = object()
+
+def read_ahead(chunks, depth=2):
+    """Iterate chunks while a background thread reads up to depth chunks ahead
+
+    Disk reads and parsing then overlap with counting in the caller; at most
+    depth + 1 chunks are held in memory. Errors in the reader are re-raised here.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader():
+        try:
+            for chunk in chunks:
+                if not put((chunk, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as exc:
+            put((_DONE, exc))
+
+    thread = threading.Thread(target=reader, name="read-ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            chunk, error = buffer.get()
+            if chunk is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield chunk
+    finally:
+        # Also reached when the consumer stops early: release the reader thread
+        stop.set()
+        thread.join()
+
+def fit_chunks(model, chunks, read_ahead_depth=2):
+    """partial_fit model on every (X, y) chunk, reading ahead on a background thread
+
+    Training continues from the model's current state; read_ahead_depth=0 reads in
+    the foreground.
+    """
+    if read_ahead_depth:
+        chunks = read_ahead(chunks, read_ahead_depth)
+    n_chunks = 0
+    for X, y in chunks:
+        model.partial_fit(X, y)
+        n_chunks += 1
+    if n_chunks == 0:
+        raise ValueError("fit_chunks received no chunks")
+    return model
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a Naive Bayes model out of core from .npy or CSV/TSV files")
+    parser.add_argument("data", help="feature .npy file, or a CSV/TSV file with a label column")
+    parser.add_argument("output", help="where to save the fitted model (Serialization format)")
+    parser.add_argument("--kind", choices=list(MODEL_KINDS), default="gaussian")
+    parser.add_argument("--labels", help="label .npy file (for .npy data without a label column)")
+    parser.add_argument("--label-column", type=int, default=-1)
+    parser.add_argument("--sep", help="field separator (default: tab for .tsv, comma otherwise)")
+    parser.add_argument("--header", action="store_true", help="skip the first line of a CSV/TSV file")
+    parser.add_argument("--text-labels", action="store_true",
+                        help="keep CSV/TSV labels as strings (default: parse them as numbers, as in .npy files)")
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--read-ahead", type=int, default=2, help="chunks read ahead in the background (0: off)")
+    args = parser.parse_args()
+
+    if args.data.endswith(".npy"):
+        label_column = None if args.labels else args.label_column
+        chunks = iter_npy_chunks(args.data, args.labels, args.chunk_size, label_column)
+    else:
+        chunks = iter_csv_chunks(args.data, args.label_column, args.chunk_size, args.sep, args.header,
+                                 label_dtype=str if args.text_labels else np.float64)
+    model = fit_chunks(MODEL_KINDS[args.kind](), chunks, args.read_ahead)
+    save_model(model, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import numpy as np
+
+from Instrumentation import phase
+from Multinomial import as_csr, log_sum_exp
+from Parallel import init_params
+from Serialization import MODEL_KINDS
+
+# ==================== Mixed-Type Naive Bayes ====================
+#
+# Naive Bayes assumes features are independent given the class, so blocks of columns
+# with different likelihood families simply add their log-likelihoods:
+#   log P(c | x) = log P(c) + Σ_blocks log P(x_block | c) - log Z
+# Each block model's log_likelihood() leaves out the class term, so the prior is
+# added once for the whole model.
+
+def is_block_list(X):
+    """True when X is a list/tuple of per-block matrices (2-D arrays or CSR)
+
+    A nested Python list of rows is one dense matrix, not a list of blocks.
+    """
+    return (isinstance(X, (list, tuple)) and len(X) > 0
+            and all(as_csr(part) is not None or np.ndim(part) == 2 for part in X))
+
+class MixedNB:
+    """Naive Bayes over column blocks that each follow their own likelihood family
+
+    blocks is a list of (family, columns): family is "gaussian", "bernoulli",
+    "multinomial", "complement" or an unfitted model to copy the settings from, e.g.
+        MixedNB([("gaussian", [0, 1, 2]), ("bernoulli", slice(3, 8)),
+                 (MultinomialNB(alpha=0.5), slice(8, None))])
+    X is one dense matrix indexed by those columns (array or nested lists), or a list
+    holding each block's 2-D array or CSR matrix in order (so a multinomial block can
+    be CSR).
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.classes_ = None
+
+    def _new_model(self, family):
+        if isinstance(family, str):
+            if family not in MODEL_KINDS:
+                raise ValueError(f"unknown family {family!r}; expected one of {tuple(MODEL_KINDS)}")
+            return MODEL_KINDS[family]()
+        return type(family)(**init_params(family))
+
+    def _parts(self, X):
+        """Each block's slice of X"""
+        if is_block_list(X):
+            if len(X) != len(self.blocks):
+                raise ValueError(f"got {len(X)} block matrices for {len(self.blocks)} blocks")
+            return X
+        X = np.asarray(X)
+        return [X[:, columns] for _, columns in self.blocks]
+
+    def fit(self, X, y):
+        """Fit every block's statistics from one pass over the rows"""
+        self.classes_ = None
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y):
+        """Fold one more batch into every block"""
+        if self.classes_ is None:
+            self.models_ = [self._new_model(family) for family, _ in self.blocks]
+        y = np.asarray(y)
+        for model, part in zip(self.models_, self._parts(X)):
+            model.partial_fit(part, y)
+        self.classes_ = self.models_[0].classes_
+        return self
+
+    def merge(self, other):
+        """Combine with a model with the same blocks trained on other data"""
+        if other.classes_ is None:
+            return self
+        if self.classes_ is None:
+            self.models_ = [self._new_model(family) for family, _ in self.blocks]
+        for model, other_model in zip(self.models_, other.models_):
+            model.merge(other_model)
+        self.classes_ = self.models_[0].classes_
+        return self
+
+    @property
+    def version_(self):
+        return tuple(model.version_ for model in self.models_) if self.classes_ is not None else 0
+
+    @property
+    def class_log_prior_(self):
+        # Every block saw the same labels, so any block's prior is the model's prior
+        return self.models_[0].class_log_prior_
+
+    def joint_log_likelihood(self, X):
+        """log P(c) + Σ_blocks log P(x_block | c), accumulated into one (n x C) buffer
+
+        Each block writes its bias-free log-likelihood into one shared scratch array,
+        which is added to the result; the prior is added once at the end.
+        """
+        parts = self._parts(X)
+        jll = np.zeros((parts[0].shape[0], len(self.classes_)))
+        scratch = np.empty_like(jll)
+        for model, part in zip(self.models_, parts):
+            jll += model.log_likelihood(part, out=scratch)
+        jll += self.class_log_prior_
+        return jll
+
+    def predict_log_proba(self, X):
+        """Normalized log posteriors from a single log-sum-exp over all blocks"""
+        jll = self.joint_log_likelihood(X)
+        with phase("mixed", "normalization", jll):
+            jll -= log_sum_exp(jll, axis=1)[:, np.newaxis]  # in place: no second (n x C) array
+            return jll
+
+    def predict_proba(self, X):
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.joint_log_likelihood(X), axis=1)]
@@ -1,72 +1,639 @@
+import logging
 import math
+import re
+import zlib
 from collections import Counter
 
+import numpy as np
+
+from Instrumentation import enable_tracing, phase
+from Parallel import init_params
+from Versions import next_version
+
 def fmt(x):
     """Format numbers for better display"""
     return f"{x:.4f}"
 
-print("\n" + "="*80)
-print("📘 Multinomial Naive Bayes - Educational Version (For Text/Count Data)")
-print("="*80 + "\n")
-
-# ==================== Section 1: Training Data ====================
-print("🔹 **Section 1: Training Data - Text Documents**\n")
-
-# Training data: word counts in documents
-# Vocabulary: ["free", "win", "money", "meeting", "project", "urgent"]
-# Each document represented as word frequency vector
-spam_docs = [
-    [3, 2, 4, 0, 0, 1],   # Document 1: high frequency of "free", "win", "money"
-    [2, 1, 3, 0, 0, 0],   # Document 2
-    [4, 3, 5, 0, 1, 2]    # Document 3
-]
-
-ham_docs = [
-    [0, 0, 1, 3, 2, 0],   # Document 1: business terms
-    [1, 0, 0, 2, 3, 1],   # Document 2
-    [0, 1, 0, 4, 3, 2]    # Document 3
-]
-
-vocabulary = ["free", "win", "money", "meeting", "project", "urgent"]
-V = len(vocabulary)  # Vocabulary size
-
-print("Vocabulary: " + ", ".join(vocabulary))
-print(f"Vocabulary size (V) = {V}\n")
-
-print("Spam documents (word frequencies):")
-print("Doc | " + " | ".join(vocabulary))
-for i, doc in enumerate(spam_docs):
-    print(f" {i+1}  | " + " | ".join(f"{count:^6}" for count in doc))
-
-print("\nHam documents (word frequencies):")
-print("Doc | " + " | ".join(vocabulary))
-for i, doc in enumerate(ham_docs):
-    print(f" {i+1}  | " + " | ".join(f"{count:^6}" for count in doc))
-
-# Test document
-test_doc = [2, 1, 3, 0, 0, 1]  # Similar to spam
-print(f"\n📄 **Test Document Word Counts:**")
-for i, word in enumerate(vocabulary):
-    print(f"  {word:8s}: {test_doc[i]}")
-
-# ==================== Section 2: Calculating Parameters ====================
-print("\n" + "-"*80)
-print("🔹 **Section 2: Calculating Multinomial Parameters with Laplace Smoothing**\n")
-
-def calculate_multinomial_params(docs, class_name, alpha=1):
+# ==================== Vectorized Engine ====================
+
+def log_sum_exp(a, axis=1):
+    """Numerically stable log(sum(exp(a))) along an axis"""
+    a_max = np.max(a, axis=axis, keepdims=True)
+    a_max[~np.isfinite(a_max)] = 0
+    out = np.log(np.sum(np.exp(a - a_max), axis=axis, keepdims=True)) + a_max
+    return np.squeeze(out, axis=axis)
+
+class CSRMatrix:
+    """Compressed sparse rows: row i is data[indptr[i]:indptr[i+1]] at columns indices[...]"""
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=np.float64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = tuple(shape)
+        if len(self.indptr) != self.shape[0] + 1:
+            raise ValueError(f"indptr has length {len(self.indptr)}, expected {self.shape[0] + 1}")
+        if len(self.data) != len(self.indices) or self.indptr[-1] != len(self.data):
+            raise ValueError("data, indices and indptr[-1] must describe the same number of nonzeros")
+
+    @classmethod
+    def from_dense(cls, X):
+        """Build a CSR matrix from a dense (n_docs x V) count matrix"""
+        X = np.asarray(X, dtype=np.float64)
+        rows, cols = np.nonzero(X)
+        indptr = np.zeros(X.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=X.shape[0]), out=indptr[1:])
+        return cls(X[rows, cols], cols, indptr, X.shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def row_ids(self):
+        """Row index of every stored nonzero"""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def row_slice(self, start, stop):
+        """Rows start..stop-1 as a new CSRMatrix (clipped to the matrix like a slice)"""
+        start, stop = min(start, self.shape[0]), min(stop, self.shape[0])
+        lo, hi = self.indptr[start], self.indptr[stop]
+        return CSRMatrix(self.data[lo:hi], self.indices[lo:hi], self.indptr[start:stop + 1] - lo,
+                         (stop - start, self.shape[1]))
+
+    def take(self, rows):
+        """Rows in any order (repeats allowed) as a new CSRMatrix"""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts, lengths = self.indptr[rows], np.diff(self.indptr)[rows]
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        # Position of every kept nonzero in the source arrays
+        positions = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return CSRMatrix(self.data[positions], self.indices[positions], indptr, (len(rows), self.shape[1]))
+
+    def toarray(self):
+        X = np.zeros(self.shape)
+        np.add.at(X, (self.row_ids(), self.indices), self.data)
+        return X
+
+def as_csr(X):
+    """Return X as a CSRMatrix if it is CSR-style (data/indices/indptr), else None"""
+    if isinstance(X, CSRMatrix):
+        return X
+    if all(hasattr(X, name) for name in ("data", "indices", "indptr", "shape")):
+        return CSRMatrix(X.data, X.indices, X.indptr, X.shape)
+    return None
+
+def drop_unseen_columns(X, n_features):
+    """Dense or CSR batch without its columns at or beyond n_features
+
+    Vectorizers can grow after a model is trained; a word the model never saw carries
+    no evidence, so its column is dropped rather than indexed out of range.
+    """
+    X_csr = as_csr(X)
+    if X_csr is None:
+        X = np.asarray(X)
+        return X[:, :n_features] if X.ndim == 2 and X.shape[1] > n_features else X
+    if X_csr.shape[1] <= n_features:
+        return X_csr
+    keep = X_csr.indices < n_features
+    kept_before = np.concatenate(([0], np.cumsum(keep)))
+    return CSRMatrix(X_csr.data[keep], X_csr.indices[keep], kept_before[X_csr.indptr],
+                     (X_csr.shape[0], n_features))
+
+def sparse_row_sums(X, weights, out=None):
+    """Sum weights (nnz x k) over each CSR row segment, giving (n_rows x k) (written to out if given)"""
+    if out is None:
+        out = np.zeros((X.shape[0], weights.shape[1]))
+    else:
+        out[:] = 0
+    nonempty = np.diff(X.indptr) > 0
+    if X.nnz:
+        # reduceat over the starts of non-empty rows; empty rows stay at 0
+        out[nonempty] = np.add.reduceat(weights, X.indptr[:-1][nonempty], axis=0)
+    return out
+
+# Document weighting, applied to each batch as it is counted and again when scoring:
+#   tf="log"          count -> log(1 + count)
+#   length_norm       scale every document to unit L1 or L2 length
+#   idf=True          multiply by log((1 + n_docs) / (1 + docs containing the word)) + 1
+# Length normalization comes before idf so that Σ_docs idf·x = idf·Σ_docs x: the idf
+# factor is then applied to the per-class sums at smoothing time, and one pass over the
+# data still suffices while the document frequencies keep changing.
+
+TF_MODES = ("raw", "log")
+LENGTH_NORMS = (None, "l1", "l2")
+
+def weigh_documents(X, tf="raw", length_norm=None):
+    """Apply the tf and length-normalization options to a dense or CSR batch of counts"""
+    if tf == "raw" and length_norm is None:
+        return X
+    X_csr = as_csr(X)
+    if X_csr is not None:
+        data = np.log1p(X_csr.data) if tf == "log" else X_csr.data
+        if length_norm is not None:
+            sizes = np.abs(data) if length_norm == "l1" else data * data
+            lengths = sparse_row_sums(X_csr, sizes[:, np.newaxis])[:, 0]
+            if length_norm == "l2":
+                lengths = np.sqrt(lengths)
+            lengths[lengths == 0] = 1
+            data = data / np.repeat(lengths, np.diff(X_csr.indptr))
+        return CSRMatrix(data, X_csr.indices, X_csr.indptr, X_csr.shape)
+    X = np.asarray(X, dtype=np.float64)
+    if tf == "log":
+        X = np.log1p(X)
+    if length_norm is not None:
+        lengths = np.abs(X).sum(axis=1) if length_norm == "l1" else np.sqrt((X * X).sum(axis=1))
+        lengths[lengths == 0] = 1
+        X = X / lengths[:, np.newaxis]
+    return X
+
+class MultinomialNB:
+    """Multinomial Naive Bayes trained and scored with NumPy matrix operations
+
+    tf, idf and length_norm select the document weighting described above; the
+    defaults use raw counts.
+    """
+
+    def __init__(self, alpha=1, tf="raw", idf=False, length_norm=None):
+        if tf not in TF_MODES:
+            raise ValueError(f"tf must be one of {TF_MODES}, got {tf!r}")
+        if length_norm not in LENGTH_NORMS:
+            raise ValueError(f"length_norm must be one of {LENGTH_NORMS}, got {length_norm!r}")
+        self.alpha = alpha
+        self.tf = tf
+        self.idf = idf
+        self.length_norm = length_norm
+        self.classes_ = None
+        self.version_ = 0
+
+    def fit(self, X, y):
+        """Learn class priors and word probabilities from an (n_docs x V) count matrix
+
+        X may be dense or CSR-style; the sparse path only touches nonzero counts.
+        """
+        self.classes_ = None
+        self._accumulate(X, y)
+        return self
+
+    def partial_fit(self, X, y):
+        """Fold one more batch into the stored counts without revisiting earlier data
+
+        Smoothed log-probabilities are recomputed lazily, and only for classes
+        whose counts changed.
+        """
+        self._accumulate(X, y)
+        return self
+
+    def fit_stream(self, batches):
+        """Train from an iterable of (X_batch, y_batch) pairs without holding them all
+
+        Batches may introduce new classes or, with a growing vocabulary, new columns.
+        """
+        self.classes_ = None
+        for X, y in batches:
+            self._accumulate(X, y)
+        if self.classes_ is None:
+            raise ValueError("fit_stream received no batches")
+        return self
+
+    def _count(self, X, y):
+        """Per-class document counts, (weighted) word counts and word document counts for one batch"""
+        classes, y_idx = np.unique(np.asarray(y), return_inverse=True)
+        n_classes = len(classes)
+        class_count = np.bincount(y_idx, minlength=n_classes).astype(np.float64)
+        word_doc_count = self._word_doc_count(X)
+        X = weigh_documents(X, self.tf, self.length_norm)
+
+        X_csr = as_csr(X)
+        if X_csr is not None:
+            V = X_csr.shape[1]
+            # Flatten (class, word) into one bin index and count every token at once
+            bins = y_idx[X_csr.row_ids()] * V + X_csr.indices
+            counts = np.bincount(bins, weights=X_csr.data, minlength=n_classes * V)
+            feature_count = counts.reshape(n_classes, V)
+        else:
+            X = np.asarray(X, dtype=np.float64)
+            # One-hot class membership turns per-class word counting into one matmul
+            Y = np.zeros((X.shape[0], n_classes))
+            Y[np.arange(X.shape[0]), y_idx] = 1
+            feature_count = Y.T @ X  # (n_classes x V)
+        return classes, class_count, feature_count, word_doc_count
+
+    def _word_doc_count(self, X):
+        """Number of documents containing each word (only tracked when idf is on)"""
+        if not self.idf:
+            return None
+        X_csr = as_csr(X)
+        if X_csr is not None:
+            return np.bincount(X_csr.indices[X_csr.data != 0], minlength=X_csr.shape[1]).astype(np.float64)
+        return (np.asarray(X) != 0).sum(axis=0).astype(np.float64)
+
+    def merge(self, other):
+        """Add the counts of a model trained on other data (e.g. another shard)"""
+        if other.classes_ is None:
+            return self
+        word_doc_count = None if other.word_doc_count_ is None else other.word_doc_count_.copy()
+        self._merge_counts(other.classes_, other.class_count_.copy(), other.feature_count_.copy(), word_doc_count)
+        return self
+
+    def _accumulate(self, X, y):
+        """Add one batch's counts to the running totals, growing classes and vocabulary"""
+        with phase("multinomial", "counting", X) as timer:
+            X_csr = as_csr(X)
+            # Once the (C x V) table dwarfs the batch, scattering beats a dense per-batch bincount
+            if X_csr is not None and self.classes_ is not None and 16 * X_csr.nnz < self.feature_count_.size:
+                return self._scatter_counts(X_csr, y)
+            counts = self._count(X, y)
+            timer.allocated(*counts)
+            return self._merge_counts(*counts)
+
+    def _scatter_counts(self, X_csr, y):
+        """Add a sparse batch straight into feature_count_ without a dense temporary"""
+        classes, y_idx = np.unique(np.asarray(y), return_inverse=True)
+        class_count = np.bincount(y_idx, minlength=len(classes)).astype(np.float64)
+        word_doc_count = self._word_doc_count(X_csr)
+        X_csr = weigh_documents(X_csr, self.tf, self.length_norm)
+        rows = self._grow(classes, X_csr.shape[1])
+        np.add.at(self.feature_count_, (rows[y_idx][X_csr.row_ids()], X_csr.indices), X_csr.data)
+        self.class_count_[rows] += class_count
+        self._counts_changed(rows, word_doc_count)
+        return classes
+
+    def _merge_counts(self, classes, class_count, feature_count, word_doc_count=None):
+        if self.classes_ is None:
+            self.classes_, self.class_count_, self.feature_count_ = classes, class_count, feature_count
+            self.word_doc_count_ = word_doc_count
+            self._feature_log_prob = np.zeros_like(feature_count)
+            self._stale = np.ones(len(classes), dtype=bool)
+            self._topk_bounds = self._idf = None
+            self.version_ = next_version()
+            return classes
+
+        rows = self._grow(classes, feature_count.shape[1])
+        self.feature_count_[rows, :feature_count.shape[1]] += feature_count
+        self.class_count_[rows] += class_count
+        self._counts_changed(rows, word_doc_count)
+        return classes
+
+    def _counts_changed(self, rows, word_doc_count):
+        """Mark what the new counts invalidate; with idf every class depends on every batch"""
+        self._stale[rows] = True
+        self._topk_bounds = None
+        self.version_ = next_version()
+        if word_doc_count is not None:
+            self.word_doc_count_[:len(word_doc_count)] += word_doc_count
+            self._stale[:] = True
+            self._idf = None
+
+    def _grow(self, classes, V):
+        """Make room for new classes and vocabulary columns; returns the rows of `classes`"""
+        all_classes = np.union1d(self.classes_, classes)
+        V = max(self.feature_count_.shape[1], V)
+        if len(all_classes) != len(self.classes_) or V != self.feature_count_.shape[1]:
+            old = np.searchsorted(all_classes, self.classes_)
+            grown = np.zeros((len(all_classes), V))
+            grown[old, :self.feature_count_.shape[1]] = self.feature_count_
+            prior = np.zeros(len(all_classes))
+            prior[old] = self.class_count_
+            stale = np.ones(len(all_classes), dtype=bool)
+            log_prob = np.zeros((len(all_classes), V))
+            if V == self.feature_count_.shape[1]:
+                # Same vocabulary: rows of existing classes stay valid
+                stale[old] = self._stale
+                log_prob[old] = self._feature_log_prob
+            if self.word_doc_count_ is not None:
+                self.word_doc_count_ = np.append(self.word_doc_count_, np.zeros(V - len(self.word_doc_count_)))
+            self.classes_, self.feature_count_, self.class_count_ = all_classes, grown, prior
+            self._stale, self._feature_log_prob = stale, log_prob
+        return np.searchsorted(self.classes_, classes)
+
+    @property
+    def feature_log_prob_(self):
+        """log(P(word | class)), shape (n_classes x V); refreshed only for changed classes"""
+        if self._stale.any():
+            # Laplace smoothing: (count + α) / (total_words + α × V)
+            with phase("multinomial", "smoothing") as timer:
+                counts = self.feature_count_[self._stale]
+                if self.idf:
+                    counts = counts * self.idf_
+                smoothed = counts + self.alpha
+                totals = smoothed.sum(axis=1, keepdims=True)
+                timer.allocated(smoothed, totals)
+            with phase("multinomial", "log_table") as timer:
+                self._feature_log_prob[self._stale] = np.log(smoothed) - np.log(totals)
+                self._stale[:] = False
+        return self._feature_log_prob
+
+    @property
+    def class_log_prior_(self):
+        return np.log(self.class_count_) - np.log(self.class_count_.sum())
+
+    @property
+    def class_bias_(self):
+        """Per-class constant added to X @ feature_log_prob_.T when scoring"""
+        return self.class_log_prior_
+
+    @property
+    def idf_(self):
+        """Smoothed inverse document frequency of each word, log((1 + n) / (1 + df)) + 1"""
+        if self._idf is None:
+            n_docs = self.class_count_.sum()
+            self._idf = np.log((1 + n_docs) / (1 + self.word_doc_count_)) + 1
+        return self._idf
+
+    def transform(self, X):
+        """Documents weighted the way this model scores them (identity for raw counts)
+
+        Columns beyond the trained vocabulary are dropped after length normalization,
+        so they still count towards a document's length but never towards its score.
+        """
+        X = weigh_documents(X, self.tf, self.length_norm)
+        X = drop_unseen_columns(X, self.feature_count_.shape[1])
+        if not self.idf:
+            return X
+        X_csr = as_csr(X)
+        if X_csr is not None:
+            return CSRMatrix(X_csr.data * self.idf_[X_csr.indices], X_csr.indices, X_csr.indptr, X_csr.shape)
+        return np.asarray(X, dtype=np.float64) * self.idf_
+
+    def subset_features(self, columns):
+        """New model restricted to the given vocabulary columns, renumbered 0..len(columns)-1
+
+        Counts carry over unchanged; probabilities are re-smoothed over the smaller vocabulary.
+        """
+        compact = type(self)(**init_params(self))
+        word_doc_count = None if self.word_doc_count_ is None else np.array(self.word_doc_count_[columns])
+        compact._merge_counts(self.classes_.copy(), np.array(self.class_count_),
+                              np.array(self.feature_count_[:, columns]), word_doc_count)
+        return compact
+
+    def get_state(self):
+        """Arrays that fully describe the fitted model, for saving"""
+        state = {
+            "class_count": self.class_count_,
+            "feature_count": self.feature_count_,
+            "feature_log_prob": self.feature_log_prob_,
+        }
+        if self.word_doc_count_ is not None:
+            state["word_doc_count"] = self.word_doc_count_
+        return state
+
+    def set_state(self, classes, arrays):
+        """Restore a fitted model from get_state() arrays (which may be memory-mapped)"""
+        self.classes_ = np.asarray(classes)
+        self.class_count_ = arrays["class_count"]
+        self.feature_count_ = arrays["feature_count"]
+        self._feature_log_prob = arrays["feature_log_prob"]
+        self.word_doc_count_ = arrays.get("word_doc_count")
+        self._stale = np.zeros(len(self.classes_), dtype=bool)
+        self._topk_bounds = self._idf = None
+        self.version_ = next_version()
+        return self
+
+    def log_likelihood(self, X, out=None):
+        """log(P(x | class)) without the class term, shape (n_docs x n_classes)
+
+        Written into out when given, so callers summing several models can reuse one buffer.
+        """
+        flp = self.feature_log_prob_
+        fresh = out is None
+        with phase("multinomial", "likelihood", X) as timer:
+            X = self.transform(X)
+            X_csr = as_csr(X)
+            if X_csr is not None:
+                # Σ count_i × log(P(word_i | class)) over the stored nonzeros only
+                weights = flp.T[X_csr.indices] * X_csr.data[:, np.newaxis]
+                out = sparse_row_sums(X_csr, weights, out)
+                timer.allocated(weights)
+            else:
+                out = np.matmul(np.asarray(X, dtype=np.float64), flp.T, out=out)
+            if fresh:
+                timer.allocated(out)
+            return out
+
+    def joint_log_likelihood(self, X):
+        """log(P(x | class)) + log(P(class)) for every document and class"""
+        jll = self.log_likelihood(X)
+        jll += self.class_bias_
+        return jll
+
+    def predict_log_proba(self, X):
+        """Normalized log posteriors, shape (n_docs x n_classes)"""
+        jll = self.joint_log_likelihood(X)
+        with phase("multinomial", "normalization", jll) as timer:
+            log_proba = jll - log_sum_exp(jll, axis=1)[:, np.newaxis]
+            timer.allocated(log_proba)
+            return log_proba
+
+    def predict_proba(self, X):
+        """Normalized posteriors, shape (n_docs x n_classes)"""
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X):
+        """Most probable class label for each document"""
+        return self.classes_[np.argmax(self.joint_log_likelihood(X), axis=1)]
+
+    # ---------- Top-k scoring with class pruning ----------
+
+    def _bounds(self):
+        """Per-class and per-word extremes of log(P(word | class)) used to bound unseen terms"""
+        if self._topk_bounds is None or self._stale.any():
+            flp = self.feature_log_prob_
+            # Word-major copy: gathering a document's words then reads contiguous rows
+            self._topk_bounds = (np.ascontiguousarray(flp.T),
+                                 flp.max(axis=1), flp.min(axis=1), flp.max(axis=0), flp.min(axis=0))
+        return self._topk_bounds
+
+    def predict_topk(self, X, k=3, block_size=16):
+        """The k most probable classes per document, pruning hopeless classes early
+
+        Terms are added in blocks, largest counts first. After each block every
+        surviving class gets an upper and a lower bound on its final score from the
+        remaining counts and the precomputed extremes of log(P(word | class)); a class
+        whose upper bound falls below the k-th best lower bound can never reach the
+        top k and is dropped. Returns (labels, joint log-likelihoods), both (n_docs x k),
+        best first, matching the ranking of joint_log_likelihood.
+        """
+        X = self.transform(X)
+        X_csr = as_csr(X)
+        if X_csr is None:
+            X_csr = CSRMatrix.from_dense(X)
+        prior = self.class_bias_
+        word_major, class_max, class_min, word_max, word_min = self._bounds()
+        n_classes = len(self.classes_)
+        k = min(k, n_classes)
+
+        top_idx = np.zeros((X_csr.shape[0], k), dtype=np.int64)
+        top_scores = np.zeros((X_csr.shape[0], k))
+        for r in range(X_csr.shape[0]):
+            lo, hi = X_csr.indptr[r], X_csr.indptr[r + 1]
+            order = np.argsort(-X_csr.data[lo:hi], kind="stable")
+            cols, counts = X_csr.indices[lo:hi][order], X_csr.data[lo:hi][order]
+
+            # Remaining mass after position i: Σ counts, Σ counts·max_c, Σ counts·min_c
+            rest = np.append(np.cumsum(counts[::-1])[::-1], 0)
+            rest_max = np.append(np.cumsum((counts * word_max[cols])[::-1])[::-1], 0)
+            rest_min = np.append(np.cumsum((counts * word_min[cols])[::-1])[::-1], 0)
+
+            candidates, scores = np.arange(n_classes), prior.copy()
+            for start in range(0, len(cols), block_size):
+                stop = min(start + block_size, len(cols))
+                rows = word_major[cols[start:stop]]
+                if len(candidates) < n_classes:
+                    rows = rows[:, candidates]
+                scores += counts[start:stop] @ rows
+                if stop == len(cols) or len(candidates) <= k:
+                    continue
+                upper = scores + np.minimum(rest[stop] * class_max[candidates], rest_max[stop])
+                lower = scores + np.maximum(rest[stop] * class_min[candidates], rest_min[stop])
+                kth_lower = np.partition(lower, len(lower) - k)[len(lower) - k]
+                # Small slack so rounding can never prune a class that ties the k-th
+                keep = upper >= kth_lower - 1e-9 * (1 + abs(kth_lower))
+                candidates, scores = candidates[keep], scores[keep]
+
+            if hi > lo:
+                # Rescore survivors exactly as joint_log_likelihood does so ties order identically
+                weights = word_major[X_csr.indices[lo:hi]][:, candidates] * X_csr.data[lo:hi, np.newaxis]
+                scores = np.add.reduceat(weights, [0], axis=0)[0] + prior[candidates]
+            best = np.argsort(-scores, kind="stable")[:k]
+            top_idx[r], top_scores[r] = candidates[best], scores[best]
+        return self.classes_[top_idx], top_scores
+
+class ComplementNB(MultinomialNB):
+    """Complement Naive Bayes (Rennie et al., 2003) for imbalanced classes
+
+    Each class is described by the word counts of all *other* classes, which are
+    large even when the class itself is rare:
+        w_c = log((Σ_{c' != c} count_c' + α) / Σ_words (same))
+    and a document scores Σ x·(-w_c), so no prior is added. norm=True divides each
+    class's weights by their sum, which evens out classes with long documents.
+    Counting, streaming, merging and document weighting are inherited unchanged.
+    """
+
+    def __init__(self, alpha=1, norm=False, tf="raw", idf=False, length_norm=None):
+        super().__init__(alpha, tf, idf, length_norm)
+        self.norm = norm
+
+    @property
+    def feature_log_prob_(self):
+        """Complement weights -w_c, shape (n_classes x V); every class changes with any count"""
+        if self._stale.any():
+            with phase("complement", "smoothing") as timer:
+                counts = self.feature_count_
+                if self.idf:
+                    counts = counts * self.idf_
+                complement = counts.sum(axis=0) - counts + self.alpha
+                totals = complement.sum(axis=1, keepdims=True)
+                timer.allocated(complement, totals)
+            with phase("complement", "log_table"):
+                logged = np.log(complement) - np.log(totals)
+                if self.norm:
+                    # Dividing by the (negative) sum keeps larger values meaning "more like c"
+                    self._feature_log_prob[:] = logged / logged.sum(axis=1, keepdims=True)
+                else:
+                    self._feature_log_prob[:] = -logged
+                self._stale[:] = False
+        return self._feature_log_prob
+
+    @property
+    def class_bias_(self):
+        # With one class the complement is empty, so only the prior is informative
+        if len(self.classes_) == 1:
+            return self.class_log_prior_
+        return np.zeros(len(self.classes_))
+
+# ==================== Streaming Text Vectorizer ====================
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text, lowercase=True):
+    """Yield tokens from a document one at a time"""
+    if lowercase:
+        text = text.lower()
+    for match in TOKEN_PATTERN.finditer(text):
+        yield match.group()
+
+def read_labeled_lines(path, sep="\t", encoding="utf-8"):
+    """Stream (text, label) pairs from a file with one 'label<sep>text' per line"""
+    with open(path, encoding=encoding) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            label, _, text = line.partition(sep)
+            yield text, label
+
+class StreamingVectorizer:
+    """Turn raw documents into sparse word-count batches
+
+    With n_features=None tokens get ids from a growable vocabulary dict; otherwise
+    the hashing trick maps them into a fixed number of columns with no stored vocabulary.
+    """
+
+    def __init__(self, n_features=None, lowercase=True):
+        self.n_features = n_features
+        self.lowercase = lowercase
+        self.vocabulary_ = {} if n_features is None else None
+
+    @property
+    def n_features_(self):
+        return self.n_features if self.n_features is not None else len(self.vocabulary_)
+
+    def _feature_index(self, token, grow):
+        """Column for a token, or None if it is unknown and the vocabulary is frozen"""
+        if self.vocabulary_ is None:
+            return zlib.crc32(token.encode("utf-8")) % self.n_features
+        index = self.vocabulary_.get(token)
+        if index is None and grow:
+            index = self.vocabulary_[token] = len(self.vocabulary_)
+        return index
+
+    def _to_csr(self, texts, grow):
+        data, indices, indptr = [], [], [0]
+        for text in texts:
+            counts = Counter()
+            for token in tokenize(text, self.lowercase):
+                index = self._feature_index(token, grow)
+                if index is not None:
+                    counts[index] += 1
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        return CSRMatrix(data, indices, indptr, (len(indptr) - 1, self.n_features_))
+
+    def transform(self, texts):
+        """Count matrix for documents to score; unseen vocabulary words are dropped"""
+        return self._to_csr(texts, grow=False)
+
+    def iter_batches(self, stream, batch_size=1000):
+        """Yield (CSRMatrix, labels) training batches from an iterable of (text, label)"""
+        texts, labels = [], []
+        for text, label in stream:
+            texts.append(text)
+            labels.append(label)
+            if len(texts) == batch_size:
+                yield self._to_csr(texts, grow=True), labels
+                texts, labels = [], []
+        if texts:
+            yield self._to_csr(texts, grow=True), labels
+
+# ==================== Step-by-Step Calculations ====================
+
+logger = logging.getLogger(__name__)
+
+def calculate_multinomial_params(docs, class_name, alpha=1, vocabulary=None):
     """Calculate word probabilities for multinomial distribution"""
+    V = len(docs[0])
+    vocabulary = vocabulary or [f"word{i+1}" for i in range(V)]
     total_words = sum(sum(doc) for doc in docs)
     n_docs = len(docs)
     
     # Count total occurrences of each word in class
-    word_counts = [0] * V
-    for doc in docs:
-        for i in range(V):
-            word_counts[i] += doc[i]
+    word_counts = [sum(column) for column in zip(*docs)]
     
-    print(f"📊 **For {class_name} class:**")
-    print(f"  Total words in all documents: {total_words}")
-    print(f"  Number of documents: {n_docs}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"📊 **For {class_name} class:**")
+        logger.info(f"  Total words in all documents: {total_words}")
+        logger.info(f"  Number of documents: {n_docs}")
     
     # Calculate probabilities with Laplace smoothing
     probabilities = []
@@ -75,150 +642,235 @@ def calculate_multinomial_params(docs, class_name, alpha=1):
         prob = (count + alpha) / (total_words + alpha * V)
         probabilities.append(prob)
         
-        print(f"\n  P('{vocabulary[i]}' | {class_name}):")
-        print(f"    Count of '{vocabulary[i]}' in {class_name}: {count}")
-        print(f"    Total words in {class_name}: {total_words}")
-        print(f"    Vocabulary size (V): {V}")
-        print(f"    Laplace smoothing with α = {alpha}:")
-        print(f"    Formula: (count + α) / (total_words + α × V)")
-        print(f"    Calculation: ({count} + {alpha}) / ({total_words} + {alpha} × {V})")
-        print(f"    = {count + alpha} / {total_words + alpha * V}")
-        print(f"    = {fmt(prob)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"\n  P('{vocabulary[i]}' | {class_name}):")
+            logger.debug(f"    Count of '{vocabulary[i]}' in {class_name}: {count}")
+            logger.debug(f"    Total words in {class_name}: {total_words}")
+            logger.debug(f"    Vocabulary size (V): {V}")
+            logger.debug(f"    Laplace smoothing with α = {alpha}:")
+            logger.debug(f"    Formula: (count + α) / (total_words + α × V)")
+            logger.debug(f"    Calculation: ({count} + {alpha}) / ({total_words} + {alpha} × {V})")
+            logger.debug(f"    = {count + alpha} / {total_words + alpha * V}")
+            logger.info(f"    = {fmt(prob)}")
     
     return probabilities, total_words
 
-alpha = 1  # Laplace smoothing parameter
-print(f"Using Laplace smoothing parameter α = {alpha}\n")
-
-p_words_spam, total_spam_words = calculate_multinomial_params(spam_docs, "spam", alpha)
-print("\n" + "-"*40)
-p_words_ham, total_ham_words = calculate_multinomial_params(ham_docs, "ham", alpha)
-
-# ==================== Section 3: Likelihood Calculation ====================
-print("\n" + "-"*80)
-print("🔹 **Section 3: Calculating Document Likelihood**\n")
-
-def multinomial_likelihood(doc, word_probs, class_name):
+def multinomial_likelihood(doc, word_probs, class_name, vocabulary=None):
     """Calculate multinomial likelihood with log probabilities"""
-    likelihood = 0
+    vocabulary = vocabulary or [f"word{i+1}" for i in range(len(doc))]
     log_likelihood = 0
+    tracing = logger.isEnabledFor(logging.DEBUG)
     
-    print(f"📌 **Calculating P(x | {class_name}):**")
-    print("  Multinomial formula: P(x | class) ∝ Π_i [P(word_i | class)^{count_i}]")
-    print("  Where Π (pi) means product over all words")
-    print("  In practice, we use log to avoid underflow:")
-    print("  log(P(x | class)) = Σ_i [count_i × log(P(word_i | class))]")
-    print()
+    if tracing:
+        logger.debug(f"📌 **Calculating P(x | {class_name}):**")
+        logger.debug("  Multinomial formula: P(x | class) ∝ Π_i [P(word_i | class)^{count_i}]")
+        logger.debug("  Where Π (pi) means product over all words")
+        logger.debug("  In practice, we use log to avoid underflow:")
+        logger.debug("  log(P(x | class)) = Σ_i [count_i × log(P(word_i | class))]")
+        logger.debug("")
+        logger.debug("  Word-by-word calculation:")
     
-    print("  Word-by-word calculation:")
-    for i in range(V):
-        count = doc[i]
-        prob = word_probs[i]
+    for i, (count, prob) in enumerate(zip(doc, word_probs)):
         if count > 0 and prob > 0:
-            term = (prob ** count)
             log_term = count * math.log(prob)
-            likelihood_term = term
             log_likelihood += log_term
             
-            print(f"    '{vocabulary[i]}': count={count}, P={fmt(prob)}")
-            print(f"      Contribution: {fmt(prob)}^{count} = {fmt(term)}")
-            print(f"      Log contribution: {count} × log({fmt(prob)}) = {fmt(log_term)}")
+            if tracing:
+                logger.debug(f"    '{vocabulary[i]}': count={count}, P={fmt(prob)}")
+                logger.debug(f"      Contribution: {fmt(prob)}^{count} = {fmt(prob ** count)}")
+                logger.debug(f"      Log contribution: {count} × log({fmt(prob)}) = {fmt(log_term)}")
     
     likelihood = math.exp(log_likelihood)
-    print(f"\n  Total log-likelihood = {fmt(log_likelihood)}")
-    print(f"  Likelihood (exp of log-likelihood) = e^{fmt(log_likelihood)} = {fmt(likelihood)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"\n  Total log-likelihood = {fmt(log_likelihood)}")
+        logger.info(f"  Likelihood (exp of log-likelihood) = e^{fmt(log_likelihood)} = {fmt(likelihood)}")
     
     return likelihood, log_likelihood
 
-print("🎯 **For Spam class:**")
-p_x_spam, log_p_x_spam = multinomial_likelihood(test_doc, p_words_spam, "spam")
-
-print("\n🎯 **For Ham class:**")
-p_x_ham, log_p_x_ham = multinomial_likelihood(test_doc, p_words_ham, "ham")
-
-# ==================== Section 4: Prior Probabilities ====================
-print("\n" + "-"*80)
-print("🔹 **Section 4: Prior Probabilities**\n")
-
-n_spam = len(spam_docs)
-n_ham = len(ham_docs)
-n_total = n_spam + n_ham
-
-p_spam_prior = n_spam / n_total
-p_ham_prior = n_ham / n_total
-
-print("Prior probabilities based on document frequency:")
-print(f"  Total documents: {n_total}")
-print(f"  Spam documents: {n_spam}, Ham documents: {n_ham}")
-print(f"  P(spam) = {n_spam} / {n_total} = {fmt(p_spam_prior)}")
-print(f"  P(ham) = {n_ham} / {n_total} = {fmt(p_ham_prior)}")
-
-# ==================== Section 5: Posterior Calculation ====================
-print("\n" + "-"*80)
-print("🔹 **Section 5: Posterior Probability Calculation**\n")
-
-print("Using log probabilities for numerical stability:")
-print("  log(P(spam | x)) ∝ log(P(x | spam)) + log(P(spam))")
-print("  log(P(ham | x)) ∝ log(P(x | ham)) + log(P(ham))")
-
-log_posterior_spam = log_p_x_spam + math.log(p_spam_prior)
-log_posterior_ham = log_p_x_ham + math.log(p_ham_prior)
-
-print(f"\n📊 **Log Posteriors:**")
-print(f"  log(P(spam | x)) = {fmt(log_p_x_spam)} + log({fmt(p_spam_prior)})")
-print(f"                    = {fmt(log_p_x_spam)} + {fmt(math.log(p_spam_prior))}")
-print(f"                    = {fmt(log_posterior_spam)}")
-
-print(f"\n  log(P(ham | x)) = {fmt(log_p_x_ham)} + log({fmt(p_ham_prior)})")
-print(f"                   = {fmt(log_p_x_ham)} + {fmt(math.log(p_ham_prior))}")
-print(f"                   = {fmt(log_posterior_ham)}")
-
-# Convert back to probabilities (using log-sum-exp trick)
-max_log = max(log_posterior_spam, log_posterior_ham)
-log_sum = max_log + math.log(math.exp(log_posterior_spam - max_log) + 
-                            math.exp(log_posterior_ham - max_log))
-
-p_spam_given_x = math.exp(log_posterior_spam - log_sum)
-p_ham_given_x = math.exp(log_posterior_ham - log_sum)
-
-print(f"\n📊 **Normalized Probabilities (using log-sum-exp):**")
-print(f"  max(log values) = {fmt(max_log)}")
-print(f"  log(P(x)) = {fmt(log_sum)}")
-print(f"  P(spam | x) = exp({fmt(log_posterior_spam)} - {fmt(log_sum)})")
-print(f"              = exp({fmt(log_posterior_spam - log_sum)})")
-print(f"              = {fmt(p_spam_given_x)} = {fmt(p_spam_given_x*100)}%")
-
-print(f"\n  P(ham | x) = exp({fmt(log_posterior_ham)} - {fmt(log_sum)})")
-print(f"             = exp({fmt(log_posterior_ham - log_sum)})")
-print(f"             = {fmt(p_ham_given_x)} = {fmt(p_ham_given_x*100)}%")
-
-# ==================== Section 6: Final Decision ====================
-print("\n" + "-"*80)
-print("🔹 **Section 6: Final Decision**\n")
-
-print("🎯 **Classification Results:**")
-print(f"  P(spam | document) = {fmt(p_spam_given_x*100)}%")
-print(f"  P(ham | document)  = {fmt(p_ham_given_x*100)}%")
-
-if p_spam_given_x > p_ham_given_x:
-    decision = "SPAM"
-    confidence = (p_spam_given_x - p_ham_given_x) / p_spam_given_x
-    print(f"\n✅ **Decision: {decision}** (higher probability of being spam)")
-else:
-    decision = "HAM"
-    confidence = (p_ham_given_x - p_spam_given_x) / p_ham_given_x
-    print(f"\n✅ **Decision: {decision}** (higher probability of being legitimate)")
-
-print(f"📊 **Confidence: {fmt(confidence*100)}%**")
-
-# Show word analysis
-print(f"\n🔍 **Word Analysis for Test Document:**")
-for i, word in enumerate(vocabulary):
-    if test_doc[i] > 0:
-        print(f"  '{word}': {test_doc[i]} occurrences")
-        print(f"    P('{word}' | spam) = {fmt(p_words_spam[i])}")
-        print(f"    P('{word}' | ham)  = {fmt(p_words_ham[i])}")
-
-print("\n" + "="*80)
-print("✅ Multinomial Naive Bayes Text Classification Completed")
-print("="*80)
\ No newline at end of file
+# ==================== Walkthrough ====================
+
+def main():
+    """Run the step-by-step educational example"""
+    enable_tracing(logger, logging.DEBUG)
+
+    print("\n" + "="*80)
+    print("📘 Multinomial Naive Bayes - Educational Version (For Text/Count Data)")
+    print("="*80 + "\n")
+
+    # ==================== Section 1: Training Data ====================
+    print("🔹 **Section 1: Training Data - Text Documents**\n")
+
+    # Training data: word counts in documents
+    # Vocabulary: ["free", "win", "money", "meeting", "project", "urgent"]
+    # Each document represented as word frequency vector
+    spam_docs = [
+        [3, 2, 4, 0, 0, 1],   # Document 1: high frequency of "free", "win", "money"
+        [2, 1, 3, 0, 0, 0],   # Document 2
+        [4, 3, 5, 0, 1, 2]    # Document 3
+    ]
+
+    ham_docs = [
+        [0, 0, 1, 3, 2, 0],   # Document 1: business terms
+        [1, 0, 0, 2, 3, 1],   # Document 2
+        [0, 1, 0, 4, 3, 2]    # Document 3
+    ]
+
+    vocabulary = ["free", "win", "money", "meeting", "project", "urgent"]
+    V = len(vocabulary)  # Vocabulary size
+
+    print("Vocabulary: " + ", ".join(vocabulary))
+    print(f"Vocabulary size (V) = {V}\n")
+
+    print("Spam documents (word frequencies):")
+    print("Doc | " + " | ".join(vocabulary))
+    for i, doc in enumerate(spam_docs):
+        print(f" {i+1}  | " + " | ".join(f"{count:^6}" for count in doc))
+
+    print("\nHam documents (word frequencies):")
+    print("Doc | " + " | ".join(vocabulary))
+    for i, doc in enumerate(ham_docs):
+        print(f" {i+1}  | " + " | ".join(f"{count:^6}" for count in doc))
+
+    # Test document
+    test_doc = [2, 1, 3, 0, 0, 1]  # Similar to spam
+    print(f"\n📄 **Test Document Word Counts:**")
+    for i, word in enumerate(vocabulary):
+        print(f"  {word:8s}: {test_doc[i]}")
+
+    # ==================== Section 2: Calculating Parameters ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 2: Calculating Multinomial Parameters with Laplace Smoothing**\n")
+
+    alpha = 1  # Laplace smoothing parameter
+    print(f"Using Laplace smoothing parameter α = {alpha}\n")
+
+    p_words_spam, total_spam_words = calculate_multinomial_params(spam_docs, "spam", alpha, vocabulary)
+    print("\n" + "-"*40)
+    p_words_ham, total_ham_words = calculate_multinomial_params(ham_docs, "ham", alpha, vocabulary)
+
+    # ==================== Section 3: Likelihood Calculation ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 3: Calculating Document Likelihood**\n")
+
+    print("🎯 **For Spam class:**")
+    p_x_spam, log_p_x_spam = multinomial_likelihood(test_doc, p_words_spam, "spam", vocabulary)
+
+    print("\n🎯 **For Ham class:**")
+    p_x_ham, log_p_x_ham = multinomial_likelihood(test_doc, p_words_ham, "ham", vocabulary)
+
+    # ==================== Section 4: Prior Probabilities ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 4: Prior Probabilities**\n")
+
+    n_spam = len(spam_docs)
+    n_ham = len(ham_docs)
+    n_total = n_spam + n_ham
+
+    p_spam_prior = n_spam / n_total
+    p_ham_prior = n_ham / n_total
+
+    print("Prior probabilities based on document frequency:")
+    print(f"  Total documents: {n_total}")
+    print(f"  Spam documents: {n_spam}, Ham documents: {n_ham}")
+    print(f"  P(spam) = {n_spam} / {n_total} = {fmt(p_spam_prior)}")
+    print(f"  P(ham) = {n_ham} / {n_total} = {fmt(p_ham_prior)}")
+
+    # ==================== Section 5: Posterior Calculation ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 5: Posterior Probability Calculation**\n")
+
+    print("Using log probabilities for numerical stability:")
+    print("  log(P(spam | x)) ∝ log(P(x | spam)) + log(P(spam))")
+    print("  log(P(ham | x)) ∝ log(P(x | ham)) + log(P(ham))")
+
+    log_posterior_spam = log_p_x_spam + math.log(p_spam_prior)
+    log_posterior_ham = log_p_x_ham + math.log(p_ham_prior)
+
+    print(f"\n📊 **Log Posteriors:**")
+    print(f"  log(P(spam | x)) = {fmt(log_p_x_spam)} + log({fmt(p_spam_prior)})")
+    print(f"                    = {fmt(log_p_x_spam)} + {fmt(math.log(p_spam_prior))}")
+    print(f"                    = {fmt(log_posterior_spam)}")
+
+    print(f"\n  log(P(ham | x)) = {fmt(log_p_x_ham)} + log({fmt(p_ham_prior)})")
+    print(f"                   = {fmt(log_p_x_ham)} + {fmt(math.log(p_ham_prior))}")
+    print(f"                   = {fmt(log_posterior_ham)}")
+
+    # Convert back to probabilities (using log-sum-exp trick)
+    max_log = max(log_posterior_spam, log_posterior_ham)
+    log_sum = max_log + math.log(math.exp(log_posterior_spam - max_log) + 
+                                math.exp(log_posterior_ham - max_log))
+
+    p_spam_given_x = math.exp(log_posterior_spam - log_sum)
+    p_ham_given_x = math.exp(log_posterior_ham - log_sum)
+
+    print(f"\n📊 **Normalized Probabilities (using log-sum-exp):**")
+    print(f"  max(log values) = {fmt(max_log)}")
+    print(f"  log(P(x)) = {fmt(log_sum)}")
+    print(f"  P(spam | x) = exp({fmt(log_posterior_spam)} - {fmt(log_sum)})")
+    print(f"              = exp({fmt(log_posterior_spam - log_sum)})")
+    print(f"              = {fmt(p_spam_given_x)} = {fmt(p_spam_given_x*100)}%")
+
+    print(f"\n  P(ham | x) = exp({fmt(log_posterior_ham)} - {fmt(log_sum)})")
+    print(f"             = exp({fmt(log_posterior_ham - log_sum)})")
+    print(f"             = {fmt(p_ham_given_x)} = {fmt(p_ham_given_x*100)}%")
+
+    # ==================== Section 6: Final Decision ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 6: Final Decision**\n")
+
+    print("🎯 **Classification Results:**")
+    print(f"  P(spam | document) = {fmt(p_spam_given_x*100)}%")
+    print(f"  P(ham | document)  = {fmt(p_ham_given_x*100)}%")
+
+    if p_spam_given_x > p_ham_given_x:
+        decision = "SPAM"
+        confidence = (p_spam_given_x - p_ham_given_x) / p_spam_given_x
+        print(f"\n✅ **Decision: {decision}** (higher probability of being spam)")
+    else:
+        decision = "HAM"
+        confidence = (p_ham_given_x - p_spam_given_x) / p_ham_given_x
+        print(f"\n✅ **Decision: {decision}** (higher probability of being legitimate)")
+
+    print(f"📊 **Confidence: {fmt(confidence*100)}%**")
+
+    # Show word analysis
+    print(f"\n🔍 **Word Analysis for Test Document:**")
+    for i, word in enumerate(vocabulary):
+        if test_doc[i] > 0:
+            print(f"  '{word}': {test_doc[i]} occurrences")
+            print(f"    P('{word}' | spam) = {fmt(p_words_spam[i])}")
+            print(f"    P('{word}' | ham)  = {fmt(p_words_ham[i])}")
+
+    # ==================== Section 7: Vectorized Engine ====================
+    print("\n" + "-"*80)
+    print("🔹 **Section 7: Same Model with the Vectorized Engine**\n")
+
+    model = MultinomialNB(alpha=alpha).fit(spam_docs + ham_docs, ["spam"] * n_spam + ["ham"] * n_ham)
+    proba = model.predict_proba([test_doc])[0]
+    for label, p in zip(model.classes_, proba):
+        print(f"  P({label} | document) = {fmt(p*100)}%")
+    print(f"  Prediction: {model.predict([test_doc])[0].upper()}")
+
+    sparse_model = MultinomialNB(alpha=alpha).fit(CSRMatrix.from_dense(spam_docs + ham_docs), ["spam"] * n_spam + ["ham"] * n_ham)
+    sparse_test = CSRMatrix.from_dense([test_doc])
+    print(f"\n  Sparse (CSR) input: {sparse_test.nnz} nonzeros instead of {V} entries")
+    print(f"  P(spam | document) = {fmt(sparse_model.predict_proba(sparse_test)[0, 1]*100)}%")
+
+    raw_docs = [
+        ("free money, win free money now", "spam"),
+        ("urgent: win money for free", "spam"),
+        ("project meeting moved, urgent", "ham"),
+        ("notes from the project meeting", "ham"),
+    ]
+    vectorizer = StreamingVectorizer()
+    text_model = MultinomialNB(alpha=alpha).fit_stream(vectorizer.iter_batches(iter(raw_docs), batch_size=2))
+    raw_test = "win free money"
+    print(f"\n  Streaming from raw text ({vectorizer.n_features_} vocabulary words learned):")
+    print(f"  '{raw_test}' -> {text_model.predict(vectorizer.transform([raw_test]))[0].upper()}")
+
+    print("\n" + "="*80)
+    print("✅ Multinomial Naive Bayes Text Classification Completed")
+    print("="*80)
+
+if __name__ == "__main__":
+    main()
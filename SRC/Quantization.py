@@ -0,0 +1,115 @@
+import numpy as np
+
+from Bernouli import BernoulliNB
+from Multinomial import MultinomialNB, as_csr, drop_unseen_columns, log_sum_exp, sparse_row_sums, weigh_documents
+
+# ==================== Reduced-Precision Scoring Tables ====================
+#
+# Multinomial and Bernoulli NB both score as one linear map plus a per-class bias:
+#   multinomial: jll = X @ log P(word | class).T                 + log P(class)
+#   bernoulli:   jll = X @ (log p - log(1 - p)).T + Σ log(1 - p) + log P(class)
+# Only the (V x C) weight table is compressed; the per-class bias stays float64.
+
+PRECISIONS = ("float64", "float32", "int8")
+
+class CompressedNB:
+    """Predict-only copy of a fitted MultinomialNB/BernoulliNB with a smaller weight table
+
+    precision="float32" halves the table; "int8" stores each class's weights as
+    8-bit codes with a per-class scale and zero point, w ≈ zero + scale·q.
+    """
+
+    def __init__(self, model, precision="float32", block_size=4096):
+        if precision not in PRECISIONS:
+            raise ValueError(f"precision must be one of {PRECISIONS}, got {precision!r}")
+        self.tf, self.length_norm = "raw", None
+        if isinstance(model, MultinomialNB):
+            weights, bias, self.binary = model.feature_log_prob_, model.class_bias_, False
+            # Document weighting: tf / length norm are reapplied per batch, idf is folded into the table
+            self.tf, self.length_norm = model.tf, model.length_norm
+            if model.idf:
+                weights = weights * model.idf_
+        elif isinstance(model, BernoulliNB):
+            log_p, log_not_p = model.feature_log_prob_, model.feature_log_neg_prob_
+            weights = log_p - log_not_p
+            bias = log_not_p.sum(axis=1) + model.class_log_prior_
+            self.binary = True
+        else:
+            raise TypeError(f"cannot compress {type(model).__name__}")
+
+        self.classes_ = model.classes_
+        self.precision = precision
+        self.block_size = block_size
+        self.bias_ = np.asarray(bias, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        if precision == "int8":
+            lo, hi = weights.min(axis=1), weights.max(axis=1)
+            self.scale_ = np.where(hi > lo, (hi - lo) / 255, 1.0)
+            self.zero_ = lo + 128 * self.scale_
+            codes = np.rint((weights - lo[:, np.newaxis]) / self.scale_[:, np.newaxis]) - 128
+            self.table_ = np.ascontiguousarray(codes.T, dtype=np.int8)  # word-major (V x C)
+        else:
+            self.table_ = np.ascontiguousarray(weights.T, dtype=precision)
+
+    @property
+    def nbytes(self):
+        return self.table_.nbytes
+
+    def _rows_as_float(self, rows):
+        """Dequantized table rows (codes only; scale/zero are applied per class later)"""
+        return rows.astype(np.float32) if self.precision == "int8" else rows
+
+    def joint_log_likelihood(self, X):
+        X = drop_unseen_columns(weigh_documents(X, self.tf, self.length_norm), self.table_.shape[0])
+        X_csr = as_csr(X)
+        if X_csr is not None:
+            data = np.ones_like(X_csr.data) if self.binary else X_csr.data
+            weights = self._rows_as_float(self.table_[X_csr.indices]) * data[:, np.newaxis]
+            raw = sparse_row_sums(X_csr, weights)
+            totals = sparse_row_sums(X_csr, data[:, np.newaxis])[:, 0]
+        else:
+            X = np.asarray(X, dtype=np.float64)
+            if self.binary:
+                X = (X > 0).astype(np.float64)
+            compute = np.float64 if self.precision == "float64" else np.float32
+            X = X.astype(compute, copy=False)
+            raw = np.zeros((X.shape[0], self.table_.shape[1]))
+            # Walk the vocabulary in blocks so int8 codes are widened a slice at a time
+            for start in range(0, self.table_.shape[0], self.block_size):
+                stop = start + self.block_size
+                raw += X[:, start:stop] @ self._rows_as_float(self.table_[start:stop])
+            totals = X.sum(axis=1, dtype=np.float64)
+        if self.precision == "int8":
+            raw = raw * self.scale_ + totals[:, np.newaxis] * self.zero_
+        return raw + self.bias_
+
+    def predict_log_proba(self, X):
+        jll = self.joint_log_likelihood(X)
+        return jll - log_sum_exp(jll, axis=1)[:, np.newaxis]
+
+    def predict_proba(self, X):
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.joint_log_likelihood(X), axis=1)]
+
+def precision_report(model, X, precisions=("float32", "int8")):
+    """How far each compressed table drifts from the float64 model on sample data X
+
+    For each precision: fraction of rows whose argmax class is unchanged, the largest
+    absolute change of any posterior probability, and the table size.
+    """
+    reference = CompressedNB(model, "float64")
+    ref_proba = reference.predict_proba(X)
+    ref_best = np.argmax(ref_proba, axis=1)
+    report = {}
+    for precision in precisions:
+        compressed = CompressedNB(model, precision)
+        proba = compressed.predict_proba(X)
+        report[precision] = {
+            "argmax_agreement": float(np.mean(np.argmax(proba, axis=1) == ref_best)),
+            "max_posterior_drift": float(np.max(np.abs(proba - ref_proba))),
+            "table_bytes": compressed.nbytes,
+            "compression": reference.nbytes / compressed.nbytes,
+        }
+    return report
@@ -0,0 +1,111 @@
+import json
+import struct
+
+import numpy as np
+
+from Bernouli import BernoulliNB
+from Gaussian import GaussianNB
+from Multinomial import ComplementNB, MultinomialNB
+from Parallel import init_params
+
+# ==================== Binary Model Format ====================
+#
+# Layout (little-endian):
+#   8 bytes   magic b"NBMODEL\0"
+#   4 bytes   format version (uint32)
+#   4 bytes   header length in bytes (uint32)
+#   header    UTF-8 JSON: model kind, constructor params, class labels and, for
+#             every array, its name, dtype, shape and byte offset in the file
+#   arrays    raw C-ordered data, each starting on a 64-byte boundary
+
+MAGIC = b"NBMODEL\0"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+MODEL_KINDS = {"multinomial": MultinomialNB, "complement": ComplementNB, "bernoulli": BernoulliNB,
+               "gaussian": GaussianNB}
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def _kind_of(model):
+    for kind, model_class in MODEL_KINDS.items():
+        if type(model) is model_class:
+            return kind
+    raise TypeError(f"cannot save {type(model).__name__}; expected one of "
+                    + ", ".join(c.__name__ for c in MODEL_KINDS.values()))
+
+def save_model(model, path, dtype=np.float64):
+    """Write a fitted model to path
+
+    Probability/parameter tables are stored as dtype (float32 halves the file);
+    count arrays always stay float64 so they remain exact for later partial_fit.
+    """
+    if model.classes_ is None:
+        raise ValueError("model is not fitted")
+    kind = _kind_of(model)
+    state = model.get_state()
+    arrays = {}
+    for name, values in state.items():
+        target = np.float64 if "count" in name else dtype
+        arrays[name] = np.ascontiguousarray(values, dtype=target)
+
+    def build_header(data_start):
+        offset, entries = data_start, []
+        for name, values in arrays.items():
+            entries.append({"name": name, "dtype": values.dtype.str,
+                            "shape": list(values.shape), "offset": offset})
+            offset = _align(offset + values.nbytes)
+        header = {"kind": kind, "params": init_params(model),
+                  "classes": np.asarray(model.classes_).tolist(), "arrays": entries}
+        return json.dumps(header).encode("utf-8")
+
+    # The header stores absolute offsets, so size it once and rebuild until stable
+    data_start = _align(16)
+    while True:
+        header = build_header(data_start)
+        needed = _align(16 + len(header))
+        if needed <= data_start:
+            break
+        data_start = needed
+
+    with open(path, "wb") as f:
+        f.write(MAGIC + struct.pack("<II", FORMAT_VERSION, len(header)) + header)
+        for entry, values in zip(json.loads(header)["arrays"], arrays.values()):
+            f.write(b"\0" * (entry["offset"] - f.tell()))
+            f.write(values.tobytes())
+
+def read_header(path):
+    """Format version and decoded JSON header of a saved model"""
+    with open(path, "rb") as f:
+        prefix = f.read(16)
+        if len(prefix) < 16 or prefix[:8] != MAGIC:
+            raise ValueError(f"{path} is not a Naive Bayes model file")
+        version, header_len = struct.unpack("<II", prefix[8:])
+        if version > FORMAT_VERSION:
+            raise ValueError(f"{path} uses format version {version}; "
+                             f"this code reads up to version {FORMAT_VERSION}")
+        return version, json.loads(f.read(header_len).decode("utf-8"))
+
+def load_model(path, mmap_mode="r"):
+    """Open a saved model; arrays are memory-mapped unless mmap_mode is None
+
+    mmap_mode="r" shares one page-cached copy between processes (read-only),
+    "c" is copy-on-write so partial_fit can update the loaded counts privately,
+    and None reads everything into memory.
+    """
+    _, header = read_header(path)
+    arrays = {}
+    for entry in header["arrays"]:
+        dtype, shape = np.dtype(entry["dtype"]), tuple(entry["shape"])
+        if mmap_mode is None:
+            with open(path, "rb") as f:
+                f.seek(entry["offset"])
+                arrays[entry["name"]] = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+        elif int(np.prod(shape)) == 0:
+            arrays[entry["name"]] = np.zeros(shape, dtype=dtype)
+        else:
+            arrays[entry["name"]] = np.memmap(path, dtype=dtype, mode=mmap_mode,
+                                              offset=entry["offset"], shape=shape)
+    model = MODEL_KINDS[header["kind"]](**header["params"])
+    return model.set_state(header["classes"], arrays)
@@ -0,0 +1,217 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from Caching import PredictionCache
+from Multinomial import CSRMatrix, MultinomialNB
+from Serialization import load_model
+
+# ==================== Micro-Batching Prediction Service ====================
+#
+# Protocol: one JSON object per line, over localhost TCP or a Unix socket.
+#   {"id": 7, "features": [2, 1, 3, 0, 0, 1]}              dense feature vector
+#   {"id": 8, "indices": [0, 2], "values": [2, 3]}         sparse feature vector
+#   {"cmd": "stats"}                                       latency / batch / cache report
+# Replies echo "id" and carry "label" and "proba" (in the order of "classes").
+
+def n_features_of(model):
+    if hasattr(model, "feature_count_"):
+        return model.feature_count_.shape[1]
+    return model.stats_.mean_.shape[1]
+
+class ServingStats:
+    """Request latencies (recent window) and a power-of-two batch size histogram"""
+
+    def __init__(self, window=10000):
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.batches = 0
+
+    def record_latency(self, seconds):
+        self.latencies.append(seconds)
+        self.requests += 1
+
+    def record_batch(self, size):
+        bucket = 1 << (size.bit_length() - 1)
+        self.batch_sizes[bucket] += 1
+        self.batches += 1
+
+    def snapshot(self):
+        latencies_ms = np.array(self.latencies) * 1000
+        report = {"requests": self.requests, "batches": self.batches,
+                  "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+                  "batch_size_histogram": {f"{b}-{2 * b - 1}": n for b, n in sorted(self.batch_sizes.items())}}
+        if len(latencies_ms):
+            report["latency_ms"] = {"p50": float(np.percentile(latencies_ms, 50)),
+                                    "p99": float(np.percentile(latencies_ms, 99)),
+                                    "max": float(latencies_ms.max())}
+        return report
+
+class MicroBatcher:
+    """Collect concurrent requests and score each batch with one vectorized call
+
+    A batch closes when it reaches max_batch_size or max_wait_ms after its first
+    request arrived, whichever comes first. With cache_size > 0, repeated feature
+    vectors are answered from a PredictionCache instead of being rescored.
+    """
+
+    def __init__(self, model, max_batch_size=64, max_wait_ms=2.0, cache_size=0):
+        self.model = model
+        self.predictor = PredictionCache(model, cache_size) if cache_size else model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.n_features = n_features_of(model)
+        self.classes = np.asarray(model.classes_).tolist()
+        self.stats = ServingStats()
+        self.queue = asyncio.Queue()
+
+    async def submit(self, request):
+        """Queue one request and wait for its (label, proba) result"""
+        start = time.perf_counter()
+        row = self._parse(request)  # bad input fails here, not for the whole batch
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((row, future))
+        result = await future
+        self.stats.record_latency(time.perf_counter() - start)
+        return result
+
+    def _parse(self, request):
+        """(column indices, values) of one request's feature vector"""
+        if "features" in request:
+            row = np.asarray(request["features"], dtype=np.float64)
+            if row.shape != (self.n_features,):
+                raise ValueError(f"expected {self.n_features} features, got {row.size}")
+            cols = np.flatnonzero(row)
+            return cols, row[cols]
+        cols = np.asarray(request["indices"], dtype=np.int64)
+        vals = np.asarray(request["values"], dtype=np.float64)
+        if cols.shape != vals.shape:
+            raise ValueError("indices and values must have the same length")
+        if len(cols) and (cols.min() < 0 or cols.max() >= self.n_features):
+            raise ValueError(f"feature index out of range [0, {self.n_features})")
+        return cols, vals
+
+    def _to_matrix(self, rows):
+        """Stack a batch of parsed rows into the matrix the model scores"""
+        if isinstance(self.model, MultinomialNB):
+            indptr = np.cumsum([0] + [len(cols) for cols, _ in rows])
+            return CSRMatrix(np.concatenate([vals for _, vals in rows]),
+                             np.concatenate([cols for cols, _ in rows]),
+                             indptr, (len(rows), self.n_features))
+        X = np.zeros((len(rows), self.n_features))
+        for i, (cols, vals) in enumerate(rows):
+            X[i, cols] = vals
+        return X
+
+    async def _next_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self):
+        """Batching loop; run it as a background task for the server's lifetime"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            self.stats.record_batch(len(batch))
+            try:
+                X = self._to_matrix([row for row, _ in batch])
+                # Score off the event loop so new requests keep queueing meanwhile
+                proba = await loop.run_in_executor(None, self.predictor.predict_proba, X)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            best = np.argmax(proba, axis=1)
+            for (_, future), row, k in zip(batch, proba, best):
+                if not future.done():
+                    future.set_result((self.classes[k], row.tolist()))
+
+async def _handle_line(batcher, line, writer):
+    request = {}
+    try:
+        request = json.loads(line)
+        if request.get("cmd") == "stats":
+            reply = batcher.stats.snapshot()
+            if isinstance(batcher.predictor, PredictionCache):
+                reply["cache"] = batcher.predictor.stats()
+        else:
+            label, proba = await batcher.submit(request)
+            reply = {"label": label, "proba": proba, "classes": batcher.classes}
+    except Exception as exc:
+        reply = {"error": str(exc)}
+        if not isinstance(request, dict):
+            request = {}
+    if "id" in request:
+        reply["id"] = request["id"]
+    writer.write((json.dumps(reply) + "\n").encode("utf-8"))
+    await writer.drain()
+
+async def _handle_connection(batcher, reader, writer):
+    # Lines are handled concurrently so a pipelining client also fills batches
+    tasks = set()
+    try:
+        while line := await reader.readline():
+            if line.strip():
+                task = asyncio.create_task(_handle_line(batcher, line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        writer.close()
+
+async def serve(model, host="127.0.0.1", port=8765, unix_path=None, max_batch_size=64, max_wait_ms=2.0,
+                cache_size=0):
+    """Serve a fitted model (or a path to a saved one) until cancelled"""
+    if isinstance(model, str):
+        model = load_model(model)
+    batcher = MicroBatcher(model, max_batch_size, max_wait_ms, cache_size)
+    batch_task = asyncio.create_task(batcher.run())
+
+    def handler(reader, writer):
+        return _handle_connection(batcher, reader, writer)
+
+    if unix_path:
+        server = await asyncio.start_unix_server(handler, path=unix_path)
+    else:
+        server = await asyncio.start_server(handler, host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batch_task.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a saved Naive Bayes model with request micro-batching")
+    parser.add_argument("model", help="model file written by Serialization.save_model")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--cache-size", type=int, default=0, help="LRU prediction cache entries (0: off)")
+    args = parser.parse_args()
+    asyncio.run(serve(args.model, args.host, args.port, args.unix, args.max_batch, args.max_wait_ms,
+                      args.cache_size))
+
+if __name__ == "__main__":
+    main()
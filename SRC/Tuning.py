@@ -0,0 +1,173 @@
+import numpy as np
+
+from Bernouli import BernoulliNB
+from Gaussian import MIN_VARIANCE, GaussianStats
+from Multinomial import MultinomialNB, as_csr, log_sum_exp, sparse_row_sums, weigh_documents
+
+# ==================== Cross-Validated Smoothing Sweep ====================
+#
+# alpha (Multinomial / Bernoulli) and var_smoothing (Gaussian) only change how the
+# same sufficient statistics are smoothed, so nothing is retrained per candidate:
+#   1. one counting pass with labels fold × n_classes + class gives every fold's stats
+#   2. the training stats of fold f are the totals minus fold f
+#   3. the held-out rows of fold f are scored against the whole grid at once, as one
+#      (n_f x V) @ (V x grid·C) product
+# Each sweep returns {"param", "grid", "accuracy", "log_loss", "fold_accuracy",
+# "fold_log_loss", "best"}; "best" maximizes mean accuracy, ties broken by log loss.
+# A class with fewer than n_folds rows is missing from some fold's training set; as in a
+# refit, it gets prior -inf there, so its held-out rows are errors with infinite log loss.
+
+def assign_folds(y, n_folds=5, seed=0):
+    """Stratified fold number of every sample: each class is dealt round-robin in random order"""
+    y_idx = np.unique(np.asarray(y), return_inverse=True)[1]
+    order = np.lexsort((np.random.default_rng(seed).random(len(y_idx)), y_idx))
+    folds = np.empty(len(y_idx), dtype=np.int64)
+    folds[order] = np.arange(len(y_idx)) % n_folds
+    return folds
+
+def _fold_labels(y, n_folds, seed):
+    """Classes, class index, fold number and the combined fold·C + class label"""
+    classes, y_idx = np.unique(np.asarray(y), return_inverse=True)
+    folds = assign_folds(y, n_folds, seed)
+    return classes, y_idx, folds, folds * len(classes) + y_idx
+
+def _per_fold(model_classes, values, n_folds, n_classes):
+    """Scatter stats fitted on combined labels into an (n_folds x n_classes x ...) array"""
+    values = np.asarray(values)
+    full = np.zeros((n_folds * n_classes,) + values.shape[1:])
+    full[np.asarray(model_classes, dtype=np.int64)] = values
+    return full.reshape((n_folds, n_classes) + values.shape[1:])
+
+def _take(X, rows):
+    X_csr = as_csr(X)
+    return X_csr.take(rows) if X_csr is not None else np.asarray(X)[rows]
+
+def _linear_scores(X, weights, block_elements=1 << 22):
+    """X @ weights.T for dense or CSR X and weights of shape (grid·C x V)
+
+    CSR rows go in blocks so the gathered (nnz x grid·C) weights stay near block_elements.
+    """
+    X_csr = as_csr(X)
+    if X_csr is None:
+        return np.asarray(X, dtype=np.float64) @ weights.T
+    word_major = np.ascontiguousarray(weights.T)
+    out = np.empty((X_csr.shape[0], weights.shape[0]))
+    nnz_per_row = max(X_csr.nnz / max(X_csr.shape[0], 1), 1)
+    step = max(int(block_elements / (nnz_per_row * weights.shape[0])), 1)
+    for start in range(0, X_csr.shape[0], step):
+        block = X_csr.row_slice(start, start + step)
+        gathered = word_major[block.indices] * block.data[:, np.newaxis]
+        out[start:start + block.shape[0]] = sparse_row_sums(block, gathered)
+    return out
+
+def _report(param, grid, fold_jll, y_idx, folds):
+    """Accuracy and log loss per grid value from each fold's (n_f x grid x C) scores"""
+    grid = np.asarray(grid, dtype=np.float64)
+    n_folds = len(fold_jll)
+    fold_accuracy = np.zeros((n_folds, len(grid)))
+    fold_log_loss = np.zeros((n_folds, len(grid)))
+    for f, jll in enumerate(fold_jll):
+        truth = y_idx[folds == f]
+        log_proba = jll - log_sum_exp(jll, axis=2)[:, :, np.newaxis]
+        fold_accuracy[f] = (np.argmax(jll, axis=2) == truth[:, np.newaxis]).mean(axis=0)
+        fold_log_loss[f] = -log_proba[np.arange(len(truth)), :, truth].mean(axis=0)
+    # Folds differ in size by at most one row per class, so plain means are fine
+    accuracy, log_loss = fold_accuracy.mean(axis=0), fold_log_loss.mean(axis=0)
+    best = np.lexsort((log_loss, -accuracy))[0]
+    return {"param": param, "grid": grid, "accuracy": accuracy, "log_loss": log_loss,
+            "fold_accuracy": fold_accuracy, "fold_log_loss": fold_log_loss, "best": grid[best]}
+
+def sweep_multinomial_alpha(X, y, alphas, n_folds=5, seed=0, tf="raw", length_norm=None):
+    """k-fold CV of MultinomialNB(alpha) for every alpha in the grid from one counting pass"""
+    classes, y_idx, folds, combined = _fold_labels(y, n_folds, seed)
+    C = len(classes)
+    counter = MultinomialNB(tf=tf, length_norm=length_norm).fit(X, combined)
+    fold_count = _per_fold(counter.classes_, counter.feature_count_, n_folds, C)    # (k, C, V)
+    fold_docs = _per_fold(counter.classes_, counter.class_count_, n_folds, C)       # (k, C)
+    total_count, total_docs = fold_count.sum(axis=0), fold_docs.sum(axis=0)
+    alphas = np.asarray(alphas, dtype=np.float64)[:, np.newaxis, np.newaxis]
+    V = fold_count.shape[2]
+
+    fold_jll = []
+    for f in range(n_folds):
+        count = total_count - fold_count[f]
+        docs = total_docs - fold_docs[f]
+        with np.errstate(divide="ignore"):
+            prior = np.log(docs) - np.log(docs.sum())
+        # (A, C, V): Laplace-smoothed log P(word | class) for every alpha at once
+        log_prob = np.log(count + alphas) - np.log(count.sum(axis=1, keepdims=True) + alphas * V)
+        held_out = weigh_documents(_take(X, np.flatnonzero(folds == f)), tf, length_norm)
+        jll = _linear_scores(held_out, log_prob.reshape(-1, V)).reshape(-1, len(alphas), C) + prior
+        fold_jll.append(jll)
+    return _report("alpha", alphas.ravel(), fold_jll, y_idx, folds)
+
+def sweep_bernoulli_alpha(X, y, alphas, n_folds=5, seed=0):
+    """k-fold CV of BernoulliNB(alpha): p = (count + α) / (n + 2α) for every alpha at once"""
+    classes, y_idx, folds, combined = _fold_labels(y, n_folds, seed)
+    C = len(classes)
+    X = (np.asarray(X) > 0).astype(np.float64)
+    counter = BernoulliNB().fit(X, combined)
+    fold_count = _per_fold(counter.classes_, counter.feature_count_, n_folds, C)
+    fold_docs = _per_fold(counter.classes_, counter.class_count_, n_folds, C)
+    total_count, total_docs = fold_count.sum(axis=0), fold_docs.sum(axis=0)
+    alphas = np.asarray(alphas, dtype=np.float64)[:, np.newaxis, np.newaxis]
+    k = X.shape[1]
+
+    fold_jll = []
+    for f in range(n_folds):
+        count = total_count - fold_count[f]
+        docs = total_docs - fold_docs[f]
+        with np.errstate(divide="ignore"):
+            prior = np.log(docs) - np.log(docs.sum())
+        p = (count + alphas) / (docs[:, np.newaxis] + 2 * alphas)            # (A, C, k)
+        log_not_p = np.log1p(-p)
+        bias = log_not_p.sum(axis=2) + prior                                  # (A, C)
+        held_out = X[folds == f]
+        jll = held_out @ (np.log(p) - log_not_p).reshape(-1, k).T
+        fold_jll.append(jll.reshape(-1, len(alphas), C) + bias)
+    return _report("alpha", alphas.ravel(), fold_jll, y_idx, folds)
+
+def sweep_gaussian_var_smoothing(X, y, epsilons, n_folds=5, seed=0):
+    """k-fold CV of GaussianNB(var_smoothing) for every epsilon from per-fold count/mean/M2"""
+    classes, y_idx, folds, combined = _fold_labels(y, n_folds, seed)
+    C = len(classes)
+    X = np.asarray(X, dtype=np.float64)
+    stats = GaussianStats().update(X, combined)
+    n_f = _per_fold(stats.classes_, stats.count_, n_folds, C)                # (k, C)
+    mean_f = _per_fold(stats.classes_, stats.mean_, n_folds, C)              # (k, C, F)
+    m2_f = _per_fold(stats.classes_, stats.m2_, n_folds, C)
+    # Totals by Chan's formula over the folds
+    n = n_f.sum(axis=0)
+    mean = (n_f[:, :, np.newaxis] * mean_f).sum(axis=0) / n[:, np.newaxis]
+    m2 = (m2_f + n_f[:, :, np.newaxis] * (mean_f - mean) ** 2).sum(axis=0)
+    epsilons = np.asarray(epsilons, dtype=np.float64)[:, np.newaxis, np.newaxis]
+    F = X.shape[1]
+
+    fold_jll = []
+    for f in range(n_folds):
+        # Remove fold f: the inverse of merging it in. A class whose rows all fall in
+        # fold f gets mean 0 and prior -inf, so it drops out of shift and is never predicted
+        n_t = n - n_f[f]
+        seen = np.maximum(n_t, 1)[:, np.newaxis]
+        present = (n_t > 0)[:, np.newaxis]
+        mean_t = np.where(present, (n[:, np.newaxis] * mean - n_f[f][:, np.newaxis] * mean_f[f]) / seen, 0.0)
+        delta = mean_f[f] - mean_t
+        m2_t = m2 - m2_f[f] - delta ** 2 * (n_t * n_f[f] / n)[:, np.newaxis]
+        # One training row has variance exactly 0; subtraction would leave rounding residue
+        var = np.where((n_t > 1)[:, np.newaxis], np.maximum(m2_t, 0) / seen, 0.0)
+        var = var + epsilons * var.max()                                      # (E, C, F)
+        var = np.where(var == 0, MIN_VARIANCE, var)
+
+        shift = (n_t @ mean_t) / n_t.sum()
+        theta = mean_t - shift
+        inv_two_var = 1 / (2 * var)
+        with np.errstate(divide="ignore"):
+            log_prior = np.log(n_t) - np.log(n_t.sum())
+        const = (log_prior
+                 - 0.5 * np.log(2 * np.pi * var).sum(axis=2)
+                 - (theta * theta * inv_two_var).sum(axis=2))                # (E, C)
+        held_out = X[folds == f] - shift
+        jll = (held_out @ (2 * theta * inv_two_var).reshape(-1, F).T
+               - (held_out * held_out) @ inv_two_var.reshape(-1, F).T)
+        fold_jll.append(jll.reshape(-1, len(epsilons), C) + const)
+    return _report("var_smoothing", epsilons.ravel(), fold_jll, y_idx, folds)
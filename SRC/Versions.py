@@ -0,0 +1,12 @@
+import itertools
+
+# ==================== Model Versions ====================
+#
+# Every change to a fitted model (fit, partial_fit, merge, set_state) draws a new
+# version_ from one process-wide counter, so caches can tell results apart even
+# across model types.
+
+_model_versions = itertools.count(1)
+
+def next_version():
+    return next(_model_versions)
@@ -0,0 +1,252 @@
+import io
+import logging
+
+import numpy as np
+import pytest
+
+from Benchmark import make_bernoulli, make_gaussian, make_multinomial
+from Bernouli import BernoulliNB, pack_bits
+from Caching import PredictionCache, take_rows
+from Gaussian import GaussianNB, GaussianStats
+from Instrumentation import enable_tracing
+from Mixed import MixedNB
+from Multinomial import ComplementNB, CSRMatrix, MultinomialNB
+from Parallel import parallel_fit
+from Serialization import load_model, save_model
+from Tuning import assign_folds, sweep_bernoulli_alpha, sweep_gaussian_var_smoothing, sweep_multinomial_alpha
+
+# ==================== Parallel Training ====================
+
+@pytest.mark.parametrize("model_class, make", [
+    (MultinomialNB, make_multinomial),
+    (BernoulliNB, make_bernoulli),
+    (GaussianNB, make_gaussian),
+])
+def test_parallel_fit_is_identical_for_any_n_jobs(model_class, make):
+    X, y = make(3000, 40, 4, np.random.default_rng(0))
+    sequential = parallel_fit(model_class(), X, y, n_jobs=1, shard_size=700)
+    pooled = parallel_fit(model_class(), X, y, n_jobs=2, shard_size=700)
+    np.testing.assert_array_equal(pooled.classes_, sequential.classes_)
+    for name, value in sequential.get_state().items():
+        np.testing.assert_array_equal(pooled.get_state()[name], value, err_msg=name)
+
+@pytest.mark.parametrize("model_class, make", [(MultinomialNB, make_multinomial), (BernoulliNB, make_bernoulli)])
+def test_parallel_fit_of_counts_matches_plain_fit(model_class, make):
+    X, y = make(3000, 40, 4, np.random.default_rng(1))
+    plain = model_class().fit(X, y)
+    sharded = parallel_fit(model_class(), X, y, n_jobs=1, shard_size=700)
+    np.testing.assert_array_equal(sharded.feature_count_, plain.feature_count_)
+    np.testing.assert_array_equal(sharded.feature_log_prob_, plain.feature_log_prob_)
+
+def test_parallel_fit_of_weighted_counts_matches_plain_fit_to_rounding():
+    X, y = make_multinomial(3000, 40, 4, np.random.default_rng(1))
+    params = {"tf": "log", "idf": True, "length_norm": "l2"}
+    plain = MultinomialNB(**params).fit(X, y)
+    sharded = parallel_fit(MultinomialNB(**params), X, y, n_jobs=1, shard_size=700)
+    np.testing.assert_array_equal(sharded.word_doc_count_, plain.word_doc_count_)
+    np.testing.assert_allclose(sharded.feature_count_, plain.feature_count_, rtol=1e-12)
+    np.testing.assert_allclose(sharded.joint_log_likelihood(X), plain.joint_log_likelihood(X), rtol=1e-12)
+
+# ==================== Top-k Scoring ====================
+
+@pytest.mark.parametrize("model", [
+    MultinomialNB(),
+    MultinomialNB(tf="log", idf=True, length_norm="l2"),
+    ComplementNB(norm=True),
+])
+def test_predict_topk_matches_full_scoring(model):
+    X, y = make_multinomial(2000, 300, 30, np.random.default_rng(2))
+    model.fit(X, y)
+    X_test = X.row_slice(0, 300)
+    labels, scores = model.predict_topk(X_test, k=5)
+
+    jll = model.joint_log_likelihood(X_test)
+    order = np.argsort(-jll, axis=1, kind="stable")[:, :5]
+    np.testing.assert_array_equal(labels, model.classes_[order])
+    np.testing.assert_allclose(scores, np.take_along_axis(jll, order, axis=1))
+
+# ==================== Cross-Validated Sweeps ====================
+
+def refit_scores(make_model, X, y, grid, n_folds=5):
+    """Mean accuracy and log loss over folds by refitting a model per fold and grid value"""
+    folds = assign_folds(y, n_folds)
+    classes = np.unique(y)
+    accuracy, log_loss = np.zeros((n_folds, len(grid))), np.zeros((n_folds, len(grid)))
+    for f in range(n_folds):
+        train, test = np.flatnonzero(folds != f), np.flatnonzero(folds == f)
+        truth = np.searchsorted(classes, y[test])
+        for j, value in enumerate(grid):
+            model = make_model(value).fit(take_rows(X, train), y[train])
+            # Classes missing from this fold's training rows can never be predicted
+            log_proba = np.full((len(test), len(classes)), -np.inf)
+            log_proba[:, np.searchsorted(classes, model.classes_)] = model.predict_log_proba(take_rows(X, test))
+            accuracy[f, j] = (np.argmax(log_proba, axis=1) == truth).mean()
+            log_loss[f, j] = -log_proba[np.arange(len(test)), truth].mean()
+    return accuracy.mean(axis=0), log_loss.mean(axis=0)
+
+SWEEPS = [
+    (sweep_multinomial_alpha, lambda alpha: MultinomialNB(alpha=alpha), make_multinomial, [0.01, 0.5, 2]),
+    (sweep_bernoulli_alpha, lambda alpha: BernoulliNB(alpha=alpha), make_bernoulli, [0.01, 0.5, 2]),
+    (sweep_gaussian_var_smoothing, lambda eps: GaussianNB(var_smoothing=eps), make_gaussian, [0, 1e-9, 1e-2]),
+]
+
+@pytest.mark.parametrize("rare_class", [False, True])
+@pytest.mark.parametrize("sweep, make_model, make, grid", SWEEPS)
+def test_sweep_matches_per_fold_refits(sweep, make_model, make, grid, rare_class):
+    X, y = make(400, 12, 3, np.random.default_rng(3))
+    if rare_class:
+        y[:2] = 9  # fewer rows than folds: absent from three folds' training sets
+    report = sweep(X, y, grid)
+    accuracy, log_loss = refit_scores(make_model, X, y, grid)
+    np.testing.assert_allclose(report["accuracy"], accuracy)
+    np.testing.assert_allclose(report["log_loss"], log_loss)
+    assert not np.isnan(report["fold_log_loss"]).any()
+
+# ==================== Serialization ====================
+
+@pytest.mark.parametrize("model, make", [
+    (MultinomialNB(alpha=0.5, tf="log", idf=True), make_multinomial),
+    (ComplementNB(norm=True), make_multinomial),
+    (BernoulliNB(alpha=0.3), make_bernoulli),
+    (GaussianNB(var_smoothing=1e-6), make_gaussian),
+])
+@pytest.mark.parametrize("mmap_mode", ["r", "c", None])
+def test_save_load_round_trip(model, make, mmap_mode, tmp_path):
+    X, y = make(500, 30, 3, np.random.default_rng(4))
+    model.fit(X, y)
+    path = tmp_path / "model.nbm"
+    save_model(model, path)
+    loaded = load_model(path, mmap_mode=mmap_mode)
+
+    assert type(loaded) is type(model)
+    np.testing.assert_array_equal(loaded.classes_, model.classes_)
+    np.testing.assert_array_equal(loaded.predict_log_proba(X), model.predict_log_proba(X))
+    # Counts stay exact, so training can continue from the loaded copy
+    if mmap_mode != "r":
+        loaded.partial_fit(X, y)
+        model.partial_fit(X, y)
+        np.testing.assert_allclose(loaded.predict_log_proba(X), model.predict_log_proba(X))
+
+# ==================== Mixed Column Blocks ====================
+
+def mixed_data(seed=5):
+    rng = np.random.default_rng(seed)
+    G, y = make_gaussian(300, 3, 3, rng)
+    B = (rng.random((300, 4)) < 0.2 + 0.2 * y[:, np.newaxis]).astype(np.float64)
+    W = rng.poisson(1 + y[:, np.newaxis], (300, 5)).astype(np.float64)
+    return np.hstack([G, B, W]), y
+
+MIXED_BLOCKS = [("gaussian", [0, 1, 2]), ("bernoulli", slice(3, 7)), ("multinomial", slice(7, 12))]
+
+def test_mixed_accepts_nested_lists_and_block_lists():
+    X, y = mixed_data()
+    model = MixedNB(MIXED_BLOCKS).fit(X.tolist(), y.tolist())
+    expected = MixedNB(MIXED_BLOCKS).fit(X, y).predict_log_proba(X)
+    np.testing.assert_allclose(model.predict_log_proba(X), expected)
+    # Two rows and three blocks: a nested list must still be read as rows
+    np.testing.assert_allclose(model.predict_log_proba(X[:2].tolist()), expected[:2])
+    np.testing.assert_allclose(model.predict_log_proba(X[:3].tolist()), expected[:3])
+    blocks = [X[:, 0:3], X[:, 3:7], CSRMatrix.from_dense(X[:, 7:12])]
+    np.testing.assert_allclose(model.predict_log_proba(blocks), expected)
+
+# ==================== Prediction Cache ====================
+
+@pytest.mark.parametrize("as_input", [
+    lambda X: X.tolist(),
+    lambda X: X,
+    CSRMatrix.from_dense,
+])
+def test_cache_matches_uncached_model(as_input):
+    X, y = make_multinomial(200, 30, 3, np.random.default_rng(6))
+    X = X.toarray()
+    model = MultinomialNB().fit(X, y)
+    cache = PredictionCache(model)
+    batch = np.vstack([X[:50], X[:50]])  # repeats within and across calls
+    for _ in range(2):
+        np.testing.assert_allclose(cache.predict_log_proba(as_input(batch)), model.predict_log_proba(batch))
+    np.testing.assert_array_equal(cache.predict([[2, 1, 3, 0] + [0] * 26]), model.predict([[2, 1, 3, 0] + [0] * 26]))
+    assert cache.stats()["hits"] > 0
+
+    model.partial_fit(X[50:], y[50:])
+    np.testing.assert_allclose(cache.predict_log_proba(as_input(batch)), model.predict_log_proba(batch))
+    assert cache.stats()["invalidations"] == 1
+
+def test_cache_accepts_mixed_block_lists():
+    X, y = mixed_data()
+    model = MixedNB(MIXED_BLOCKS).fit(X, y)
+    cache = PredictionCache(model)
+    blocks = [X[:, 0:3], X[:, 3:7], CSRMatrix.from_dense(X[:, 7:12])]
+    np.testing.assert_allclose(cache.predict_log_proba(blocks), model.predict_log_proba(X))
+    np.testing.assert_allclose(cache.predict_log_proba(X.tolist()), model.predict_log_proba(X))
+    assert cache.stats()["hits"] == len(X)
+
+# ==================== Walkthrough Tracing ====================
+
+def test_enable_tracing_reuses_its_handler():
+    logger = logging.getLogger("test_walkthrough")
+    first, second = io.StringIO(), io.StringIO()
+    enable_tracing(logger, logging.INFO, first)
+    handler = enable_tracing(logger, logging.INFO, second)
+    logger.info("step")
+    assert logger.handlers == [handler]
+    assert first.getvalue() == "" and second.getvalue() == "step\n"
+
+# ==================== Bit-Packed Scoring ====================
+
+@pytest.mark.parametrize("n_features, block_elements", [(1, 1 << 20), (63, 1 << 20), (64, 256), (130, 1000)])
+def test_packed_scoring_matches_dense(n_features, block_elements):
+    X, y = make_bernoulli(500, n_features, 4, np.random.default_rng(7), density=0.3)
+    model = BernoulliNB().fit(X, y)
+    np.testing.assert_allclose(model.joint_log_likelihood_packed(pack_bits(X), block_elements),
+                               model.joint_log_likelihood(X), rtol=1e-12, atol=1e-12)
+
+# ==================== Sparse Input ====================
+
+@pytest.mark.parametrize("model", [
+    MultinomialNB(),
+    MultinomialNB(tf="log", idf=True, length_norm="l2"),
+    ComplementNB(norm=True),
+])
+def test_csr_scores_equal_dense(model):
+    X, y = make_multinomial(1000, 200, 5, np.random.default_rng(8))
+    dense = X.toarray()
+    sparse_scores = model.fit(X, y).joint_log_likelihood(X)
+    np.testing.assert_allclose(model.joint_log_likelihood(dense), sparse_scores, rtol=1e-12)
+    np.testing.assert_allclose(model.fit(dense, y).joint_log_likelihood(dense), sparse_scores, rtol=1e-12)
+
+# ==================== Incremental Training ====================
+
+@pytest.mark.parametrize("model_class, make", [(MultinomialNB, make_multinomial), (BernoulliNB, make_bernoulli)])
+@pytest.mark.parametrize("by_label", [False, True])  # by_label: later chunks bring classes not seen yet
+def test_partial_fit_over_chunks_equals_fit(model_class, make, by_label):
+    X, y = make(2000, 50, 4, np.random.default_rng(9))
+    order = np.argsort(y, kind="stable") if by_label else np.arange(len(y))
+    X, y = (X.take(order) if isinstance(X, CSRMatrix) else X[order]), y[order]
+    plain = model_class().fit(X, y)
+    chunked = model_class()
+    for start in range(0, len(y), 300):
+        rows = np.arange(start, min(start + 300, len(y)))
+        chunked.partial_fit(X.take(rows) if isinstance(X, CSRMatrix) else X[rows], y[rows])
+    np.testing.assert_array_equal(chunked.classes_, plain.classes_)
+    for name, value in plain.get_state().items():
+        np.testing.assert_array_equal(chunked.get_state()[name], value, err_msg=name)
+
+# ==================== Streaming Gaussian Statistics ====================
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 250, 2000])
+@pytest.mark.parametrize("combine", ["update", "merge"])
+def test_chunked_gaussian_stats_equal_batch_mean_and_var(chunk_size, combine):
+    X, y = make_gaussian(2000, 10, 3, np.random.default_rng(10))
+    X = X + 1e4  # a large offset is where a naive sum-of-squares variance loses precision
+    stats = GaussianStats()
+    for start in range(0, len(y), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        if combine == "update":
+            stats.update(X[chunk], y[chunk])
+        else:
+            stats.merge(GaussianStats().update(X[chunk], y[chunk]))
+    np.testing.assert_array_equal(stats.classes_, np.unique(y))
+    for row, label in enumerate(stats.classes_):
+        np.testing.assert_array_equal(stats.count_[row], np.sum(y == label))
+        np.testing.assert_allclose(stats.mean_[row], X[y == label].mean(axis=0), rtol=1e-12)
+        np.testing.assert_allclose(stats.var_[row], X[y == label].var(axis=0), rtol=1e-9)